@@ -2,14 +2,175 @@
 """
 Encrypting passwords
 """
+import os
+import time
+import asyncio
+import threading
 import bcrypt
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List
 
 
-def hash_password(password: str) -> bytes:
+DEFAULT_ROUNDS = 12
+MIN_ROUNDS = 4
+MAX_ROUNDS = 31
+_ROUNDS = None
+_ROUNDS_LOCK = threading.Lock()
+
+
+def time_hash(rounds: int, samples: int = 3) -> float:
+    """Returns the best time in ms of hashing a password at cost rounds"""
+    best = None
+    for _ in range(samples):
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds))
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def calibrate_rounds(
+        target_ms: float = 250,
+        min_rounds: int = MIN_ROUNDS,
+        max_rounds: int = MAX_ROUNDS
+        ) -> int:
+    """Returns the highest bcrypt cost hashing within target_ms on this
+    machine, never lower than min_rounds
+
+    Each extra round doubles the work, so costs are measured upwards
+    and the next one is skipped once it would obviously be too slow.
+    """
+    rounds = min_rounds
+    elapsed = time_hash(rounds)
+    while rounds < max_rounds and elapsed * 2 <= target_ms:
+        elapsed = time_hash(rounds + 1)
+        if elapsed > target_ms:
+            break
+        rounds += 1
+    return rounds
+
+
+def get_rounds() -> int:
+    """Returns the cost used by hash_password
+
+    Set by PERSONAL_DATA_BCRYPT_ROUNDS: a cost, or "auto" to calibrate
+    once against PERSONAL_DATA_BCRYPT_TARGET_MS (250 by default).
+    Concurrent first calls wait for a single calibration, so it is not
+    skewed by other calibrations competing for the CPU.
+    """
+    global _ROUNDS
+    if _ROUNDS is None:
+        with _ROUNDS_LOCK:
+            if _ROUNDS is None:
+                rounds = os.getenv("PERSONAL_DATA_BCRYPT_ROUNDS")
+                if rounds == "auto":
+                    _ROUNDS = calibrate_rounds(float(
+                        os.getenv("PERSONAL_DATA_BCRYPT_TARGET_MS", 250)
+                    ))
+                elif rounds:
+                    _ROUNDS = int(rounds)
+                else:
+                    _ROUNDS = DEFAULT_ROUNDS
+    return _ROUNDS
+
+
+def hash_password(password: str, rounds: int = None) -> bytes:
     """Returns an encrypted password"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+    if rounds is None:
+        rounds = get_rounds()
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds))
 
 
 def is_valid(hashed_password: bytes, password: str) -> bool:
     """Validates that the provided password matches the hashed password"""
     return bcrypt.checkpw(password.encode('utf-8'), hashed_password)
+
+
+def needs_rehash(hashed_password: bytes, rounds: int = None) -> bool:
+    """Returns True if hashed_password was not made with the current cost,
+    to re-hash it after the next successful is_valid"""
+    if rounds is None:
+        rounds = get_rounds()
+    try:
+        return int(hashed_password.split(b"$")[2]) != rounds
+    except (IndexError, ValueError):
+        return True
+
+
+class HashingService:
+    """Runs hash_password / is_valid on a thread pool
+
+    bcrypt releases the GIL while hashing, so a batch keeps every core
+    busy and the async variants never block the event loop.
+    """
+
+    def __init__(self, max_workers: int = None) -> None:
+        """Initializes the pool, one thread per core by default
+
+        The cost is resolved first, so a calibration runs alone instead
+        of against the pool's hashes.
+        """
+        get_rounds()
+        self._executor = ThreadPoolExecutor(
+            max_workers or os.cpu_count() or 1,
+            thread_name_prefix="bcrypt"
+        )
+
+    def __enter__(self) -> "HashingService":
+        """Supports `with HashingService() as service:`"""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Shuts the pool down"""
+        self.close()
+
+    def close(self) -> None:
+        """Waits for pending hashes and shuts the pool down"""
+        self._executor.shutdown()
+
+    def hash_many(self, passwords: Iterable[str]) -> List[bytes]:
+        """Returns the encrypted passwords, in order"""
+        return list(self._executor.map(hash_password, passwords))
+
+    def verify_many(
+            self,
+            hashed_passwords: Iterable[bytes],
+            passwords: Iterable[str]
+            ) -> List[bool]:
+        """Validates each password against its hashed password"""
+        return list(self._executor.map(is_valid, hashed_passwords, passwords))
+
+    async def hash_password_async(self, password: str) -> bytes:
+        """Returns an encrypted password without blocking the loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, hash_password, password
+        )
+
+    async def is_valid_async(
+            self,
+            hashed_password: bytes,
+            password: str
+            ) -> bool:
+        """Validates a password without blocking the loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, is_valid, hashed_password, password
+        )
+
+    async def hash_many_async(self, passwords: Iterable[str]) -> List[bytes]:
+        """Returns the encrypted passwords, in order"""
+        return list(await asyncio.gather(
+            *(self.hash_password_async(password) for password in passwords)
+        ))
+
+    async def verify_many_async(
+            self,
+            hashed_passwords: Iterable[bytes],
+            passwords: Iterable[str]
+            ) -> List[bool]:
+        """Validates each password against its hashed password"""
+        return list(await asyncio.gather(*(
+            self.is_valid_async(hashed_password, password)
+            for hashed_password, password in zip(hashed_passwords, passwords)
+        )))
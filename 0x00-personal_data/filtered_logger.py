@@ -4,12 +4,23 @@ Filter Logger Module
 """
 import os
 import re
+import queue
+import atexit
+import copy
+import sys
+import time
 import logging
+import threading
+import multiprocessing
 import mysql.connector
-from typing import List
+from collections import deque
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Iterator, List, Tuple
 
 
 PII_FIELDS = ("name", "email", "phone", "ssn", "password")
+USER_FIELDS = "name,email,phone,ssn,password,ip,last_login,user_agent"
 
 
 def filter_datum(
@@ -28,59 +39,490 @@ def filter_datum(
     all fields in the log line (message)
     Return: log message obfuscated
     """
-    return re.sub(
-        "({})=.*?(?={})".format("|".join(fields), separator),
-        r"\1={}".format(redaction),
-        message
-    )
+    return _ENGINE.redact(fields, redaction, message, separator)
+
+
+class RedactionEngine:
+    """Compiles redaction patterns once and keeps the compiled
+    redactors in a bounded LRU keyed by (fields, separator, redaction)
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        """Initializes the engine with an LRU of maxsize redactors"""
+        self._redactor = lru_cache(maxsize=maxsize)(self._compile)
+
+    @staticmethod
+    def _compile(
+            fields: Tuple[str, ...],
+            separator: str,
+            redaction: str
+            ) -> Callable[[str], str]:
+        """Builds the redactor for a key, only called on a cache miss"""
+        pattern = re.compile(
+            "({})=.*?(?={})".format("|".join(fields), separator)
+        )
+        replacement = r"\1={}".format(redaction)
+        return lambda message: pattern.sub(replacement, message)
+
+    def redactor(
+            self,
+            fields: List[str],
+            redaction: str,
+            separator: str
+            ) -> Callable[[str], str]:
+        """Returns the compiled redactor for fields/redaction/separator"""
+        return self._redactor(tuple(fields), separator, redaction)
+
+    def redact(
+            self,
+            fields: List[str],
+            redaction: str,
+            message: str,
+            separator: str
+            ) -> str:
+        """Returns the log message obfuscated"""
+        return self.redactor(fields, redaction, separator)(message)
+
+
+_ENGINE = RedactionEngine()
+
+
+class TokenRedactor:
+    """Regex-free redactor walking the message once, token by token.
+
+    Produces the same output as the regex redactor: a token is masked
+    from its first `field=` onwards, the last token (not followed by the
+    separator) is left untouched, and values holding a newline are
+    skipped just like `.*?` would.
+    """
+
+    def __init__(
+            self,
+            fields: List[str],
+            redaction: str,
+            separator: str
+            ) -> None:
+        """Initializes the redactor"""
+        # an empty alternation matches before every "=" in the regex path
+        self.fields = frozenset(fields) or frozenset(("",))
+        self.lengths = sorted({len(field) for field in self.fields})
+        self.redaction = redaction
+        self.separator = separator
+
+    def _redact_token(self, token: str) -> str:
+        """Masks a single token"""
+        eq = token.find("=")
+        while eq != -1:
+            for length in self.lengths:
+                if length <= eq and token[eq - length:eq] in self.fields:
+                    if "\n" not in token[eq + 1:]:
+                        return token[:eq + 1] + self.redaction
+                    break
+            eq = token.find("=", eq + 1)
+        return token
+
+    def __call__(self, message: str) -> str:
+        """Returns the log message obfuscated"""
+        tokens = message.split(self.separator)
+        last = tokens.pop()
+        tokens = [self._redact_token(token) for token in tokens]
+        tokens.append(last)
+        return self.separator.join(tokens)
+
+
+class BatchingStreamHandler(logging.StreamHandler):
+    """Stream handler buffering formatted lines and writing them in one
+    call once capacity lines are pending or queue has been drained"""
+
+    def __init__(self, stream=None, queue=None, capacity: int = 100):
+        """Initializes the handler"""
+        super().__init__(stream)
+        self.queue = queue
+        self.capacity = capacity
+        self.buffer = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Buffers a formatted record"""
+        try:
+            self.buffer.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+        if len(self.buffer) >= self.capacity or \
+                self.queue is None or self.queue.empty():
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes out the pending lines"""
+        self.acquire()
+        try:
+            if self.buffer:
+                self.stream.write("".join(self.buffer))
+                self.buffer = []
+            super().flush()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """Writes out the pending lines before closing"""
+        self.flush()
+        super().close()
+
+
+class RowQueueHandler(QueueHandler):
+    """Queue handler leaving rows logged as tuples, lists or dicts
+    untouched, so RowRedactingFormatter masks them on the listener
+    thread instead of receiving them already rendered with str()"""
 
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Prepares a record for queuing"""
+        if not isinstance(record.msg, (tuple, list, dict)):
+            return super().prepare(record)
+        record = copy.copy(record)
+        record.exc_info = None
+        record.exc_text = None
+        record.stack_info = None
+        return record
 
-def get_logger() -> logging.Logger:
-    """Returns a logger for the user data"""
+
+_LISTENERS = []
+
+
+def close_loggers() -> None:
+    """Drains and stops every asynchronous logger made by get_logger,
+    registered with atexit so no record is lost at shutdown"""
+    while _LISTENERS:
+        listener, stream, queue_handler = _LISTENERS.pop()
+        # records logged from now on must not wait for a stopped listener
+        logging.getLogger("user_data").removeHandler(queue_handler)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        if stream is not None:
+            stream.close()
+
+
+atexit.register(close_loggers)
+
+
+def get_logger(
+        asynchronous: bool = False,
+        filename: str = None,
+        capacity: int = 100,
+        columns: List[str] = None
+        ) -> logging.Logger:
+    """Returns a logger for the user data
+
+    With asynchronous, records are only queued on the calling thread:
+    a QueueListener thread redacts, formats and writes them to stderr
+    (or to filename) in batches of up to capacity lines.
+    With columns, rows can be logged as tuples or dicts, see
+    RowRedactingFormatter.
+    """
+    if columns is None:
+        formatter = RedactingFormatter(PII_FIELDS)
+    else:
+        formatter = RowRedactingFormatter(PII_FIELDS, columns)
     logger = logging.getLogger("user_data")
     logger.setLevel(logging.INFO)
     logger.propagate = False
-    stream_handler = logging.StreamHandler()
-    stream_handler.setFormatter(RedactingFormatter(PII_FIELDS))
-    logger.addHandler(stream_handler)
+    if not asynchronous:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+        logger.addHandler(stream_handler)
+        return logger
+
+    log_queue = queue.SimpleQueue()
+    stream = None if filename is None else open(filename, "a")
+    handler = BatchingStreamHandler(stream, log_queue, capacity)
+    handler.setFormatter(formatter)
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    queue_handler = RowQueueHandler(log_queue)
+    _LISTENERS.append((listener, stream, queue_handler))
+    logger.addHandler(queue_handler)
     return logger
 
 
-def get_db() -> mysql.connector.connection.MySQLConnection:
-    """Returns a connection to a MySQL database"""
-    conn = mysql.connector.connect(
+def _connect() -> mysql.connector.connection.MySQLConnection:
+    """Opens a new connection to the MySQL database"""
+    return mysql.connector.connect(
         user=os.getenv("PERSONAL_DATA_DB_USERNAME", "root"),
         password=os.getenv("PERSONAL_DATA_DB_PASSWORD", ""),
         host=os.getenv("PERSONAL_DATA_DB_HOST", "localhost"),
         database=os.getenv("PERSONAL_DATA_DB_NAME")
     )
-    return conn
 
 
-def main() -> None:
+class PooledConnection:
+    """Connection checked out of a ConnectionPool, closing it
+    returns the underlying connection to the pool"""
+
+    def __init__(self, pool: "ConnectionPool", conn) -> None:
+        """Wraps conn for pool"""
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name: str):
+        """Delegates everything else to the underlying connection"""
+        if self._conn is None:
+            raise AttributeError("connection returned to the pool")
+        return getattr(self._conn, name)
+
+    def __enter__(self) -> "PooledConnection":
+        """Supports `with get_db() as conn:`"""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Returns the connection to the pool"""
+        self.close()
+
+    def close(self) -> None:
+        """Checks the connection back in"""
+        if self._conn is not None:
+            self._pool.checkin(self._conn)
+            self._conn = None
+
+
+class ConnectionPool:
+    """Small blocking pool of connections made by factory
+
+    At most size connections are checked out at once; idle connections
+    older than idle_timeout seconds are closed instead of reused.
+    Connections must provide is_connected(), rollback() and close().
+    """
+
+    def __init__(
+            self,
+            factory: Callable[[], object],
+            size: int = 5,
+            idle_timeout: float = 300
+            ) -> None:
+        """Initializes an empty pool"""
+        self.factory = factory
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.pid = os.getpid()
+        self.stats = {
+            "created": 0, "reused": 0, "expired": 0,
+            "checkouts": 0, "checkins": 0, "discarded": 0,
+        }
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def checkout(self, timeout: float = None) -> PooledConnection:
+        """Returns an idle connection, or a new one if none is left"""
+        if not self._slots.acquire(timeout=timeout):
+            raise RuntimeError("connection pool exhausted")
+        conn = None
+        expired = []
+        with self._lock:
+            deadline = time.monotonic() - self.idle_timeout
+            while self._idle and self._idle[0][1] < deadline:
+                expired.append(self._idle.popleft()[0])
+            if self._idle:
+                conn = self._idle.pop()[0]
+                self.stats["reused"] += 1
+            self.stats["expired"] += len(expired)
+            self.stats["checkouts"] += 1
+        for old in expired:
+            old.close()
+        if conn is None:
+            try:
+                conn = self.factory()
+            except Exception:
+                self._slots.release()
+                raise
+            with self._lock:
+                self.stats["created"] += 1
+        return PooledConnection(self, conn)
+
+    def checkin(self, conn) -> None:
+        """Puts a connection back in the pool
+
+        The open transaction is rolled back so the next borrower does
+        not inherit its snapshot; a connection that is no longer
+        connected or fails to roll back is closed instead of pooled.
+        """
+        try:
+            healthy = conn.is_connected()
+            if healthy:
+                conn.rollback()
+        except Exception:
+            healthy = False
+        if not healthy:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        with self._lock:
+            if healthy:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self.stats["discarded"] += 1
+            self.stats["checkins"] += 1
+        self._slots.release()
+
+    def close(self) -> None:
+        """Closes all idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for conn, _ in idle:
+            conn.close()
+
+
+_POOL = None
+
+
+def get_db_pool() -> ConnectionPool:
+    """Returns the process wide pool, configured by
+    PERSONAL_DATA_DB_POOL_SIZE and PERSONAL_DATA_DB_POOL_IDLE_TIMEOUT"""
+    global _POOL
+    # a forked child must not share its parent's sockets
+    if _POOL is None or _POOL.pid != os.getpid():
+        _POOL = ConnectionPool(
+            _connect,
+            size=int(os.getenv("PERSONAL_DATA_DB_POOL_SIZE", 5)),
+            idle_timeout=float(
+                os.getenv("PERSONAL_DATA_DB_POOL_IDLE_TIMEOUT", 300)
+            )
+        )
+    return _POOL
+
+
+def get_db() -> mysql.connector.connection.MySQLConnection:
+    """Returns a connection to a MySQL database
+
+    When PERSONAL_DATA_DB_POOL_SIZE is set the connection comes from
+    get_db_pool() and close() hands it back to the pool.
+    """
+    if int(os.getenv("PERSONAL_DATA_DB_POOL_SIZE", 0)) > 0:
+        return get_db_pool().checkout()
+    return _connect()
+
+
+def stream_rows(cursor, batch_size: int) -> Iterator[tuple]:
+    """Yields the rows of an executed query, fetching batch_size rows
+    at a time so the result set is never held in memory"""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield from rows
+
+
+def main(batch_size: int = None) -> None:
     """Retrieves all rows in the users table and
-    display each row under a filtered format"""
+    display each row under a filtered format
+
+    Rows are streamed from an unbuffered cursor in batches of
+    batch_size (PERSONAL_DATA_BATCH_SIZE, 1000 by default).
+    """
+    if batch_size is None:
+        batch_size = int(os.getenv("PERSONAL_DATA_BATCH_SIZE", 1000))
 
     conn = get_db()
-    user_logger = get_logger()
+    user_logger = get_logger(columns=USER_FIELDS.split(","))
 
-    fields = "name,email,phone,ssn,password,ip,last_login,user_agent"
-    query = "SELECT {} FROM users".format(fields)
-    columns = fields.split(",")
-    with conn.cursor() as cursor:
+    query = "SELECT {} FROM users".format(USER_FIELDS)
+    with conn.cursor(buffered=False) as cursor:
         cursor.execute(query)
-        users = cursor.fetchall()
-
-        for user in users:
-            record = map(
-                lambda x: '{}={}'.format(x[0], x[1]),
-                zip(columns, user),
-            )
-            message = '{};'.format('; '.join(list(record)))
-            user_logger.info(message)
+        for row in stream_rows(cursor, batch_size):
+            user_logger.info(row)
     conn.close()
 
 
+_WORKER = {}
+
+
+def _init_export_worker() -> None:
+    """Builds the formatter owned by a pool worker"""
+    _WORKER["formatter"] = RowRedactingFormatter(
+        PII_FIELDS, USER_FIELDS.split(",")
+    )
+
+
+def _format_batch(batch: Tuple[int, List[tuple], str]):
+    """Formats one batch of rows of the users table
+
+    Return:
+        - the (formatted lines, number of rows) if no output directory
+          is given
+        - the (path, number of rows) of the batch file otherwise
+    """
+    index, rows, output_dir = batch
+    formatter = _WORKER["formatter"]
+    text = "".join(
+        formatter.format(logging.LogRecord(
+            "user_data", logging.INFO, None, None, row, None, None
+        )) + "\n"
+        for row in rows
+    )
+    if output_dir is None:
+        return text, len(rows)
+    file_path = os.path.join(output_dir, "users_{:05d}.log".format(index))
+    with open(file_path, "w") as f:
+        f.write(text)
+    return file_path, len(rows)
+
+
+def export_partitioned(
+        processes: int = None,
+        output_dir: str = None,
+        batch_size: int = None
+        ) -> int:
+    """Exports the users table like main() across a pool of processes
+
+    The table is read once from an unbuffered cursor, batch_size rows
+    at a time, and the batches are redacted and formatted by the pool.
+    At most 2 batches per process are in flight, so memory stays flat.
+    Lines are written in order on stderr, or to one `users_<index>.log`
+    file per batch under output_dir.
+    Return: the number of exported rows
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if batch_size is None:
+        batch_size = int(os.getenv("PERSONAL_DATA_BATCH_SIZE", 1000))
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    exported = 0
+    pending = deque()
+
+    def collect() -> int:
+        """Waits for the oldest batch and writes it out"""
+        result = pending.popleft().get()
+        if output_dir is None:
+            sys.stderr.write(result[0])
+        return result[1]
+
+    conn = get_db()
+    try:
+        with multiprocessing.Pool(processes, _init_export_worker) as pool:
+            query = "SELECT {} FROM users".format(USER_FIELDS)
+            with conn.cursor(buffered=False) as cursor:
+                cursor.execute(query)
+                index = 0
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    pending.append(pool.apply_async(
+                        _format_batch, ((index, rows, output_dir),)
+                    ))
+                    index += 1
+                    if len(pending) >= processes * 2:
+                        exported += collect()
+            while pending:
+                exported += collect()
+            pool.close()
+            pool.join()
+    finally:
+        conn.close()
+    return exported
+
+
 class RedactingFormatter(logging.Formatter):
     """ Redacting Formatter class
         """
@@ -89,17 +531,92 @@ class RedactingFormatter(logging.Formatter):
     FORMAT = "[HOLBERTON] %(name)s %(levelname)s %(asctime)-15s: %(message)s"
     SEPARATOR = ";"
 
-    def __init__(self, fields: List[str]):
+    MODES = ("regex", "tokenizer")
+
+    def __init__(self, fields: List[str], mode: str = "regex"):
         super(RedactingFormatter, self).__init__(self.FORMAT)
+        if mode not in self.MODES:
+            raise ValueError("mode must be one of {}".format(self.MODES))
         self.fields = fields
+        self.mode = mode
+        self.engine = RedactionEngine()
+        if mode == "tokenizer":
+            self._redact = TokenRedactor(
+                self.fields, self.REDACTION, self.SEPARATOR
+            )
+        else:
+            self._redact = self.engine.redactor(
+                self.fields, self.REDACTION, self.SEPARATOR
+            )
 
     def format(self, record: logging.LogRecord) -> str:
         """Converts a LogRecord to an output string"""
-        record.msg = filter_datum(
-            self.fields, self.REDACTION, record.getMessage(), self.SEPARATOR
-        )
+        record.msg = self._redact(record.getMessage())
         return super().format(record)
 
 
+class RowRedactingFormatter(RedactingFormatter):
+    """ Redacting Formatter for rows logged as tuples or dicts
+
+    PII columns are masked by position before the `key=value; ...;`
+    message is built, in a single call, so nothing is parsed back.
+    A row shorter or longer than columns is zipped against them, so
+    values past the last column are dropped.
+    Any other message goes through RedactingFormatter.
+    """
+
+    def __init__(
+            self,
+            fields: List[str],
+            columns: List[str],
+            mode: str = "regex"
+            ):
+        super(RowRedactingFormatter, self).__init__(fields, mode)
+        self.columns = list(columns)
+        self._pii = frozenset(fields)
+        self._kept = [
+            i for i, column in enumerate(self.columns)
+            if column not in self._pii
+        ]
+        self._template = "{};".format("; ".join(
+            "{}={}".format(
+                column.replace("{", "{{").replace("}", "}}"),
+                self.REDACTION if column in self._pii else "{}"
+            )
+            for column in self.columns
+        ))
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Converts a LogRecord holding a row to an output string"""
+        row = record.msg
+        if isinstance(row, dict):
+            pairs = row.items()
+        elif isinstance(row, (tuple, list)) and \
+                len(row) == len(self.columns):
+            pairs = None
+            record.msg = self._template.format(*[row[i] for i in self._kept])
+        elif isinstance(row, (tuple, list)):
+            # never render a row with str(): its values have no `key=`
+            # for the regex to find, mask them by position instead
+            pairs = zip(self.columns, row)
+        else:
+            return super().format(record)
+        if pairs is not None:
+            record.msg = "{};".format("; ".join(
+                "{}={}".format(
+                    key, self.REDACTION if key in self._pii else value
+                )
+                for key, value in pairs
+            ))
+        record.args = None
+        return logging.Formatter.format(self, record)
+
+
 if __name__ == "__main__":
-    main()
+    workers = int(os.getenv("PERSONAL_DATA_WORKERS", 1))
+    if workers > 1:
+        export_partitioned(
+            workers, output_dir=os.getenv("PERSONAL_DATA_EXPORT_DIR")
+        )
+    else:
+        main()
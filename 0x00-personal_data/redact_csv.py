@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+CSV Redaction Module
+"""
+import sys
+import csv
+import time
+import logging
+import argparse
+from itertools import islice
+from typing import Iterator, List, TextIO
+from filtered_logger import PII_FIELDS, RedactingFormatter
+
+
+def read_chunks(reader: Iterator[list], chunk_size: int) -> Iterator[list]:
+    """Yields lists of at most chunk_size rows"""
+    while True:
+        chunk = list(islice(reader, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def redact_chunk(
+        chunk: List[list],
+        indexes: List[int],
+        redaction: str
+        ) -> List[list]:
+    """Masks the PII columns of every row of chunk in place"""
+    for row in chunk:
+        for index in indexes:
+            if index < len(row):
+                row[index] = redaction
+    return chunk
+
+
+def redact_csv(
+        source: TextIO,
+        output: TextIO,
+        output_format: str = "csv",
+        chunk_size: int = 10000
+        ) -> int:
+    """Redacts the PII_FIELDS columns of a CSV file with a header row
+
+    Rows are read chunk_size at a time and written either as CSV or as
+    RedactingFormatter-style log lines.
+    Return: the number of redacted rows
+    """
+    reader = csv.reader(source)
+    columns = next(reader, None)
+    if columns is None:
+        return 0
+    indexes = [i for i, column in enumerate(columns) if column in PII_FIELDS]
+    redaction = RedactingFormatter.REDACTION
+
+    handler = None
+    if output_format == "csv":
+        writer = csv.writer(output)
+        writer.writerow(columns)
+        write = writer.writerows
+    else:
+        logger = logging.getLogger("user_data.csv")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        handler = logging.StreamHandler(output)
+        handler.setFormatter(logging.Formatter(RedactingFormatter.FORMAT))
+        logger.addHandler(handler)
+
+        def write(chunk: List[list]) -> None:
+            """Logs each row as `key=value; ...;`"""
+            for row in chunk:
+                logger.info('{};'.format('; '.join(
+                    '{}={}'.format(*pair) for pair in zip(columns, row)
+                )))
+
+    count = 0
+    try:
+        for chunk in read_chunks(reader, chunk_size):
+            write(redact_chunk(chunk, indexes, redaction))
+            count += len(chunk)
+    finally:
+        # a later call must not also write to this output
+        if handler is not None:
+            logger.removeHandler(handler)
+    return count
+
+
+def main() -> None:
+    """Redacts a CSV file from the command line"""
+    parser = argparse.ArgumentParser(description=redact_csv.__doc__)
+    parser.add_argument("source", help="CSV file to redact, - for stdin")
+    parser.add_argument("-o", "--output", default="-",
+                        help="destination file, - for stdout")
+    parser.add_argument("-f", "--format", choices=("csv", "log"),
+                        default="csv", help="output format")
+    parser.add_argument("-c", "--chunk-size", type=int, default=10000,
+                        help="number of rows processed at a time")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.source == "-" else \
+        open(args.source, newline="")
+    output = sys.stdout if args.output == "-" else \
+        open(args.output, "w", newline="")
+    start = time.perf_counter()
+    try:
+        count = redact_csv(source, output, args.format, args.chunk_size)
+    finally:
+        for f in (source, output):
+            if f not in (sys.stdin, sys.stdout):
+                f.close()
+    elapsed = time.perf_counter() - start
+    sys.stderr.write("{} rows in {:.2f}s ({:.0f} rows/s)\n".format(
+        count, elapsed, count / elapsed if elapsed else 0
+    ))
+
+
+if __name__ == "__main__":
+    main()
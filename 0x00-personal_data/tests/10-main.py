@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+encrypt_password = __import__('encrypt_password')
+
+for rounds in range(encrypt_password.MIN_ROUNDS, 15):
+    print("cost {:>2}: {:8.2f} ms/hash".format(
+        rounds, encrypt_password.time_hash(rounds)))
+
+for target_ms in (50, 100, 250, 500):
+    rounds = encrypt_password.calibrate_rounds(target_ms)
+    print("target {:>3} ms => cost {}".format(target_ms, rounds))
+
+hashed = encrypt_password.hash_password("MyAmazingPassw0rd", rounds=10)
+print(encrypt_password.needs_rehash(hashed, rounds=10))
+print(encrypt_password.needs_rehash(hashed, rounds=12))
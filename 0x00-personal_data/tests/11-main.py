@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+import os
+import tempfile
+
+filtered_logger = __import__('filtered_logger')
+
+columns = filtered_logger.USER_FIELDS.split(",")
+row = ("Alice", "alice@x.com", "555-0100", "123-45-6789", "pw",
+       "10.0.0.1", "2019-11-14 06:16:24", "Mozilla")
+
+formatter = filtered_logger.RowRedactingFormatter(
+    filtered_logger.PII_FIELDS, columns)
+record = filtered_logger.logging.LogRecord(
+    "user_data", filtered_logger.logging.INFO, None, None, row, None, None)
+print(formatter.format(record))
+
+path = os.path.join(tempfile.mkdtemp(), "user_data.log")
+logger = filtered_logger.get_logger(
+    asynchronous=True, filename=path, columns=columns)
+logger.info(row)
+logger.info(dict(zip(columns, row)))
+logger.info("name=Bob;email=bob@x.com;ip=10.0.0.2;")
+filtered_logger.close_loggers()
+
+with open(path) as f:
+    lines = f.read().splitlines()
+for line in lines:
+    print(line.split(": ", 1)[1])
+secrets = row[:5] + ("Bob", "bob@x.com")
+print(len(lines), any(value in line for line in lines for value in secrets))
+
+""" Rows of the wrong length are masked by position too """
+for short in (row[:7], list(row[1:]), row + ("extra",)):
+    record = filtered_logger.logging.LogRecord(
+        "user_data", filtered_logger.logging.INFO, None, None, short,
+        None, None)
+    message = formatter.format(record)
+    print(message)
+    print(any(value in message for value in secrets))
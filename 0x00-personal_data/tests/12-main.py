@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+import os
+import tempfile
+
+filtered_logger = __import__('filtered_logger')
+
+path = os.path.join(tempfile.mkdtemp(), "user_data.log")
+logger = filtered_logger.get_logger(
+    asynchronous=True, filename=path, capacity=64)
+for i in range(5000):
+    logger.info("name=Bob;email=bob@x.com;id={};".format(i))
+filtered_logger.close_loggers()
+
+""" Every record is written, in order, once the loggers are closed """
+with open(path) as f:
+    messages = [line.split(": ", 1)[1] for line in f.read().splitlines()]
+print(len(messages))
+print(messages[0])
+print(messages == ["name=***;email=***;id={};".format(i)
+                   for i in range(5000)])
+
+""" Closing detaches the queue handler """
+print(logger.handlers)
+logger = filtered_logger.get_logger(asynchronous=True, filename=path)
+for i in range(3):
+    logger.info("message {}".format(i))
+filtered_logger.close_loggers()
+logger.info("message 3")
+with open(path) as f:
+    lines = f.read().splitlines()
+print(len(lines), [line.split(": ", 1)[1] for line in lines[-3:]])
+print(logger.handlers)
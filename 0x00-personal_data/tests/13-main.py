@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+import contextlib
+import io
+
+filtered_logger = __import__('filtered_logger')
+
+
+class FakeCursor:
+    """Stand-in for an unbuffered MySQL cursor"""
+
+    def __init__(self, rows):
+        """Initializes the cursor over rows"""
+        self.rows = rows
+        self.batches = []
+        self.query = None
+
+    def execute(self, query):
+        """Records the query"""
+        self.query = query
+
+    def fetchmany(self, size):
+        """Returns the next size rows at most"""
+        batch = self.rows[:size]
+        self.rows = self.rows[size:]
+        self.batches.append(len(batch))
+        return batch
+
+    def __enter__(self):
+        """Enters the cursor context"""
+        return self
+
+    def __exit__(self, *args):
+        """Leaves the cursor context"""
+
+
+class FakeConnection:
+    """Stand-in for a MySQL connection"""
+
+    def __init__(self, rows):
+        """Initializes the connection"""
+        self.cursors = []
+        self.rows = rows
+        self.closed = False
+
+    def cursor(self, buffered=True):
+        """Opens a cursor, which must be unbuffered"""
+        print("Buffered: {}".format(buffered))
+        self.cursors.append(FakeCursor(list(self.rows)))
+        return self.cursors[-1]
+
+    def close(self):
+        """Closes the connection"""
+        self.closed = True
+
+
+rows = [("user{}".format(i), "user{}@x.com".format(i), "555-0100",
+         "123-45-6789", "pw", "10.0.0.{}".format(i % 256),
+         "2019-11-14 06:16:24", "Mozilla") for i in range(25)]
+
+""" stream_rows fetches batch_size rows at a time """
+cursor = FakeCursor(list(rows))
+print(list(filtered_logger.stream_rows(cursor, 10)) == rows)
+print(cursor.batches)
+print(list(filtered_logger.stream_rows(FakeCursor([]), 10)))
+
+""" main logs every row redacted """
+conn = FakeConnection(rows)
+filtered_logger.get_db = lambda: conn
+err = io.StringIO()
+with contextlib.redirect_stderr(err):
+    filtered_logger.main(batch_size=7)
+lines = err.getvalue().splitlines()
+print(conn.cursors[0].query)
+print(conn.cursors[0].batches, conn.closed)
+print(len(lines))
+print(lines[0].split(": ", 1)[1])
+print(any(value in line for line in lines for row in rows
+          for value in row[:5]))
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+import csv
+import io
+
+redact_csv = __import__('redact_csv').redact_csv
+
+source = "name,email,phone,ssn,password,ip\n" + "".join(
+    "user{0},user{0}@x.com,555-0100,123-45-6789,pw{0},10.0.0.{0}\n".format(i)
+    for i in range(25)
+) + "short,row\n"
+
+""" CSV output, several chunks """
+output = io.StringIO()
+print(redact_csv(io.StringIO(source), output, "csv", chunk_size=10))
+rows = list(csv.reader(io.StringIO(output.getvalue())))
+print(rows[0])
+print(rows[1])
+print(rows[-1])
+print(len(rows), any("user" in value or "pw" in value
+                     for row in rows for value in row))
+
+""" Log output """
+first = io.StringIO()
+print(redact_csv(io.StringIO(source), first, "log", chunk_size=7))
+output_log = io.StringIO()
+print(redact_csv(io.StringIO(source), output_log, "log", chunk_size=7))
+lines = output_log.getvalue().splitlines()
+print(len(lines))
+print(lines[0].split(": ", 1)[1])
+print(lines[-1].split(": ", 1)[1])
+
+""" Empty file """
+output = io.StringIO()
+print(redact_csv(io.StringIO(""), output), repr(output.getvalue()))
+
+""" Each call only writes to its own output """
+print(len(first.getvalue().splitlines()))
+print(__import__('logging').getLogger("user_data.csv").handlers)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+filtered_logger = __import__('filtered_logger')
+
+
+class FakeCursor:
+    """Stand-in for an unbuffered MySQL cursor"""
+
+    def __init__(self, rows):
+        """Initializes the cursor over rows"""
+        self.rows = rows
+
+    def execute(self, query):
+        """Ignores the query"""
+
+    def fetchmany(self, size):
+        """Returns the next size rows at most"""
+        batch = self.rows[:size]
+        self.rows = self.rows[size:]
+        return batch
+
+    def __enter__(self):
+        """Enters the cursor context"""
+        return self
+
+    def __exit__(self, *args):
+        """Leaves the cursor context"""
+
+
+class FakeConnection:
+    """Stand-in for a MySQL connection"""
+
+    def __init__(self, rows):
+        """Initializes the connection"""
+        self.rows = rows
+        self.closed = False
+
+    def cursor(self, buffered=True):
+        """Opens a cursor"""
+        return FakeCursor(list(self.rows))
+
+    def close(self):
+        """Closes the connection"""
+        self.closed = True
+
+
+class Unprintable:
+    """Value a worker fails to format"""
+
+    def __format__(self, spec):
+        """Fails"""
+        raise ValueError("cannot format")
+
+
+def make_rows(count):
+    """Returns count rows of the users table"""
+    return [("user{}".format(i), "user{}@x.com".format(i), "555-0100",
+             "123-45-6789", "pw", "10.0.{}.{}".format(i // 256, i % 256),
+             "2019-11-14 06:16:24", "Mozilla") for i in range(count)]
+
+
+def run(function, rows, *args, **kwargs):
+    """Runs function on a fake database, returns its stderr messages"""
+    conn = FakeConnection(rows)
+    filtered_logger.logging.getLogger("user_data").handlers.clear()
+    filtered_logger.get_db = lambda: conn
+    err = io.StringIO()
+    with contextlib.redirect_stderr(err):
+        result = function(*args, **kwargs)
+    messages = [line.split(": ", 1)[1]
+                for line in err.getvalue().splitlines()]
+    return result, messages, conn
+
+
+if __name__ == "__main__":
+    rows = make_rows(2500)
+
+    """ Lines are written in order, like main() """
+    _, expected, _ = run(filtered_logger.main, rows)
+    count, messages, conn = run(filtered_logger.export_partitioned, rows,
+                                processes=3, batch_size=100)
+    print(count, messages == expected, conn.closed)
+    print(messages[-1])
+
+    """ One file per batch """
+    output_dir = tempfile.mkdtemp()
+    count, messages, _ = run(filtered_logger.export_partitioned, rows,
+                             processes=2, output_dir=output_dir,
+                             batch_size=1000)
+    names = sorted(os.listdir(output_dir))
+    print(count, messages, names)
+    lines = []
+    for name in names:
+        with open(os.path.join(output_dir, name)) as f:
+            batch = [line.split(": ", 1)[1] for line in f.read().splitlines()]
+        print(name, len(batch))
+        lines.extend(batch)
+    print(lines == expected)
+
+    """ The connection is closed when a worker fails """
+    try:
+        run(filtered_logger.export_partitioned,
+            rows[:10] + [rows[10][:5] + (Unprintable(),)], processes=2,
+            batch_size=5)
+    except ValueError as e:
+        print(e, filtered_logger.get_db().closed)
+
+    """ Timings """
+    rows = make_rows(100000)
+    for name, function, kwargs in (
+            ("main", filtered_logger.main, {}),
+            ("export_partitioned, 1 process",
+             filtered_logger.export_partitioned, {"processes": 1}),
+            ("export_partitioned, 4 processes",
+             filtered_logger.export_partitioned, {"processes": 4})):
+        start = time.perf_counter()
+        run(function, rows, **kwargs)
+        print("{}: {:.2f}s".format(name, time.perf_counter() - start))
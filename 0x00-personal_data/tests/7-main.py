@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+import timeit
+
+RedactingFormatter = __import__('filtered_logger').RedactingFormatter
+PII_FIELDS = __import__('filtered_logger').PII_FIELDS
+
+regex = RedactingFormatter(fields=PII_FIELDS)
+tokenizer = RedactingFormatter(fields=PII_FIELDS, mode="tokenizer")
+
+for n_fields in (8, 32, 128):
+    for value_len in (8, 64, 512):
+        keys = (list(PII_FIELDS) + ["ip", "last_login", "user_agent"]) * \
+            n_fields
+        message = "".join(
+            "{}={};".format(key, "v" * value_len) for key in keys[:n_fields]
+        )
+        timings = []
+        for formatter in (regex, tokenizer):
+            assert formatter._redact(message) == regex._redact(message)
+            timings.append(timeit.timeit(
+                lambda: formatter._redact(message), number=2000
+            ))
+        print("fields={:<4} value_len={:<4} line_len={:<6} "
+              "regex={:.4f}s tokenizer={:.4f}s".format(
+                  n_fields, value_len, len(message), *timings))
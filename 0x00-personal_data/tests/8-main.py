@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+import time
+
+ConnectionPool = __import__('filtered_logger').ConnectionPool
+
+
+class FakeConnection:
+    """Stand-in for a MySQL connection"""
+    opened = 0
+
+    def __init__(self):
+        """Opens the fake connection"""
+        FakeConnection.opened += 1
+        self.closed = False
+        self.in_transaction = False
+        self.unread_result = False
+
+    def query(self, unread_result=False):
+        """Starts a transaction, leaving its result unread if asked"""
+        self.in_transaction = True
+        self.unread_result = unread_result
+
+    def disconnect(self):
+        """Loses the connection to the server"""
+        self.closed = True
+
+    def is_connected(self):
+        """Checks the fake connection"""
+        return not self.closed
+
+    def rollback(self):
+        """Ends the transaction"""
+        if self.unread_result:
+            raise RuntimeError("Unread result found")
+        self.in_transaction = False
+
+    def close(self):
+        """Closes the fake connection"""
+        self.closed = True
+
+
+pool = ConnectionPool(FakeConnection, size=2, idle_timeout=0.1)
+
+for _ in range(1000):
+    conn = pool.checkout()
+    conn.close()
+print("Opened: {}".format(FakeConnection.opened))
+print(pool.stats)
+
+first = pool.checkout()
+second = pool.checkout()
+try:
+    pool.checkout(timeout=0.01)
+except RuntimeError as e:
+    print(e)
+first.close()
+second.close()
+
+time.sleep(0.2)
+with pool.checkout():
+    pass
+print("Opened: {}".format(FakeConnection.opened))
+print(pool.stats)
+
+""" Transactions are rolled back, broken connections are not reused """
+with pool.checkout() as conn:
+    conn.query()
+with pool.checkout() as conn:
+    print("In transaction: {}".format(conn.in_transaction))
+    conn.query(unread_result=True)
+with pool.checkout() as conn:
+    print("Unread result: {}".format(conn.unread_result))
+    conn.disconnect()
+with pool.checkout() as conn:
+    print("Closed: {}".format(conn.closed))
+print("Opened: {}".format(FakeConnection.opened))
+print(pool.stats)
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Main file
+"""
+
+import asyncio
+
+HashingService = __import__('encrypt_password').HashingService
+
+passwords = ["MyAmazingPassw0rd", "Hello", "bobby2019"]
+
+with HashingService() as service:
+    hashed = service.hash_many(passwords)
+    print(service.verify_many(hashed, passwords))
+    print(service.verify_many(hashed, reversed(passwords)))
+
+    hashed = asyncio.run(service.hash_many_async(passwords))
+    print(asyncio.run(service.verify_many_async(hashed, passwords)))
@@ -4,15 +4,23 @@ Route module for the API
 """
 from os import getenv
 from api.v1.views import app_views
+from api.v1 import fast_json
+from api.v1.auth.auth import PathMatcher
 from flask import Flask, jsonify, abort, request
 from flask_cors import (CORS, cross_origin)
 import os
 
 
 app = Flask(__name__)
+fast_json.init_app(app)
 app.register_blueprint(app_views)
 CORS(app, resources={r"/api/v1/*": {"origins": "*"}})
 auth = None
+EXCLUDED_PATHS = PathMatcher([
+    '/api/v1/status/',
+    '/api/v1/unauthorized/',
+    '/api/v1/forbidden/',
+])
 
 AUTH_TYPE = os.getenv("AUTH_TYPE")
 if AUTH_TYPE == "basic_auth":
@@ -49,10 +57,7 @@ def before_request() -> None:
     """Runs before each request"""
     if auth is None:
         return
-    excluded_paths = [
-        '/api/v1/status/', '/api/v1/unauthorized/', '/api/v1/forbidden/'
-        ]
-    if not auth.require_auth(request.path, excluded_paths):
+    if not auth.require_auth(request.path, EXCLUDED_PATHS):
         return
     if auth.authorization_header(request) is None:
         abort(401)
@@ -3,7 +3,52 @@
 Authentication Module
 """
 from flask import request
-from typing import List, TypeVar
+from functools import lru_cache
+from typing import Iterable, List, TypeVar
+
+
+class PathMatcher():
+    """ Paths compiled for require_auth: a frozenset of the exact paths
+    and a trie, one character per level, of the prefixes of the paths
+    ending with *
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        """Compiles paths"""
+        self.paths = tuple(paths)
+        self.exact = frozenset(self.paths)
+        self.prefixes = {}
+        for ex_path in self.paths:
+            if ex_path.endswith("*"):
+                node = self.prefixes
+                for char in ex_path[:-1]:
+                    node = node.setdefault(char, {})
+                node[None] = True
+
+    def __len__(self) -> int:
+        """Returns the number of paths"""
+        return len(self.paths)
+
+    def matches(self, path: str) -> bool:
+        """ Checks if path is one of the paths or starts with the prefix
+        of a path ending with *
+        """
+        if path in self.exact:
+            return True
+        node = self.prefixes
+        for char in path:
+            if None in node:
+                return True
+            node = node.get(char)
+            if node is None:
+                return False
+        return None in node
+
+
+@lru_cache(maxsize=64)
+def compile_paths(paths: tuple) -> PathMatcher:
+    """Returns the PathMatcher of paths, compiled once"""
+    return PathMatcher(paths)
 
 
 class Auth:
@@ -11,6 +56,8 @@ class Auth:
 
     def require_auth(self, path: str, excluded_paths: List[str]) -> bool:
         """ Checks which routes need authentication
+        excluded_paths is a list of paths, a path ending with * excludes
+        every path starting with it, or a PathMatcher compiled from one
         Returns:
             - True if path is None
             - True if excluded_paths is None or an empty list
@@ -19,16 +66,13 @@ class Auth:
         """
         if path is None:
             return True
-        if excluded_paths is None or excluded_paths == []:
+        if not excluded_paths:
             return True
+        if not isinstance(excluded_paths, PathMatcher):
+            excluded_paths = compile_paths(tuple(excluded_paths))
         if not path.endswith('/'):
             path += '/'
-        if path in excluded_paths:
-            return False
-        for ex_path in excluded_paths:
-            if ex_path.endswith("*") and path.startswith(ex_path[:-1]):
-                return False
-        return True
+        return not excluded_paths.matches(path)
 
     def authorization_header(self, request=None) -> str:
         """ Validate all requests to secure the API
@@ -3,17 +3,103 @@
 """ Basic Authentication Module
 """
 import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
 from api.v1.auth.auth import Auth
 from models.user import User
 from typing import TypeVar
 
 
+class CredentialCache():
+    """ Users verified from an Authorization header, remembered for ttl
+    seconds so repeat callers skip decoding, searching and hashing
+
+    Headers are keyed by their HMAC with a per-process random key, so
+    no credential is kept in clear. An entry maps to the user ID and
+    the email and password hash it was verified against: it is dropped
+    once the user is removed or its email or password changes. At most
+    max_size entries are kept, the least recently used is evicted
+    first.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 300):
+        """Initializes the cache"""
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._secret = os.urandom(32)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, authorization_header: str) -> bytes:
+        """Returns the cache key of an Authorization header"""
+        return hmac.new(self._secret, authorization_header.encode(),
+                        hashlib.sha256).digest()
+
+    def get(self, key: bytes) -> TypeVar('User'):
+        """Returns the User cached for key, None if there is none or it
+        is no longer valid
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[3] > time.monotonic():
+                    self._entries.move_to_end(key)
+                else:
+                    del self._entries[key]
+                    entry = None
+        if entry is not None:
+            user = User.get(entry[0])
+            if user is not None and user.email == entry[1] and \
+                    user.password == entry[2]:
+                self.hits += 1
+                return user
+            with self._lock:
+                self._entries.pop(key, None)
+        self.misses += 1
+        return None
+
+    def add(self, key: bytes, user: TypeVar('User')) -> None:
+        """Remembers the User verified for key"""
+        with self._lock:
+            self._entries[key] = (user.id, user.email, user.password,
+                                  time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forgets all users"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Returns the hit and miss counters and the number of entries"""
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self._entries)}
+
+
 class BasicAuth(Auth):
     """Performs Basic Authentication on the API"""
 
     def __init__(self) -> None:
-        """Initializes the class"""
+        """Initializes the class
+        BASIC_AUTH_CACHE_SIZE (default 1024) and BASIC_AUTH_CACHE_TTL
+        (seconds, default 300) size the credential cache, 0 disables it
+        """
         super().__init__()
+        try:
+            size = int(os.getenv("BASIC_AUTH_CACHE_SIZE", 1024))
+            ttl = float(os.getenv("BASIC_AUTH_CACHE_TTL", 300))
+        except ValueError:
+            size = ttl = 0
+        self.cache = CredentialCache(size, ttl) \
+            if size > 0 and ttl > 0 else None
 
     def extract_base64_authorization_header(
             self,
@@ -107,6 +193,12 @@ class BasicAuth(Auth):
     def current_user(self, request=None) -> TypeVar('User'):
         """Overloads Auth and retrieves the User instance for a request"""
         auth_header = self.authorization_header(request)
+        key = None
+        if self.cache is not None and isinstance(auth_header, str):
+            key = self.cache.key(auth_header)
+            user = self.cache.get(key)
+            if user is not None:
+                return user
         auth_header_b64 = self.extract_base64_authorization_header(auth_header)
         decoded = self.decode_base64_authorization_header(auth_header_b64)
         user_credentials = self.extract_user_credentials(decoded)
@@ -114,4 +206,6 @@ class BasicAuth(Auth):
             user_email=user_credentials[0],
             user_pwd=user_credentials[1]
             )
+        if user is not None and key is not None:
+            self.cache.add(key, user)
         return user
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+""" Fast JSON module
+
+orjson is used when it is installed, the standard json module otherwise
+"""
+from typing import Any
+import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def stdlib_dumps(obj: Any, default=None) -> str:
+    """ Serialize obj with the standard json module, compact with sorted
+    keys like Flask responses
+    """
+    return json.dumps(obj, default=default, sort_keys=True,
+                      separators=(",", ":"))
+
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | \
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def dumps(obj: Any, default=None) -> str:
+        """ Serialize obj with orjson, values it does not know (or
+        formats differently, like datetimes) go through default
+        """
+        try:
+            return orjson.dumps(obj, default=default,
+                                option=ORJSON_OPTIONS).decode()
+        except TypeError:
+            # integers above 64 bits and other values orjson rejects
+            return stdlib_dumps(obj, default)
+else:
+    dumps = stdlib_dumps
+
+
+class FastJSONEncoder(json.JSONEncoder):
+    """ JSON encoder of Flask before 2.2 using the fast dumps
+    """
+
+    def encode(self, o: Any) -> str:
+        """ Serialize o, pretty-printed output keeps the standard path
+        """
+        if self.indent is not None:
+            return super().encode(o)
+        return dumps(o, self.default)
+
+
+try:
+    from flask.json.provider import DefaultJSONProvider
+except ImportError:
+    DefaultJSONProvider = None
+else:
+    class FastJSONProvider(DefaultJSONProvider):
+        """ JSON provider of Flask 2.2 and later using the fast dumps
+        """
+
+        def dumps(self, obj: Any, **kwargs) -> str:
+            """ Serialize obj, pretty-printed output keeps the standard
+            path
+            """
+            if kwargs.get("indent") is not None:
+                return super().dumps(obj, **kwargs)
+            return dumps(obj, kwargs.get("default", self.default))
+
+
+def init_app(app) -> None:
+    """ Make jsonify and the JSON responses of app use the fast dumps
+    """
+    if DefaultJSONProvider is not None:
+        app.json = FastJSONProvider(app)
+    else:
+        app.json_encoder = FastJSONEncoder
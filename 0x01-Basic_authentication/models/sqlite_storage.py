@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+""" SQLite storage module
+"""
+from typing import List
+import json
+import os
+import sqlite3
+import threading
+from models.base import Base, Storage
+
+
+class SQLiteStorage(Storage):
+    """ Objects stored in a SQLite database shared by processes
+
+    Each class has a table with the object JSON and one indexed column
+    per indexed attribute. The database runs in WAL mode so readers
+    never wait for a writer.
+    """
+
+    def __init__(self, db_path: str):
+        """ Initialize the storage of the database file db_path
+        """
+        self.db_path = db_path
+        self.tables = set()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """ Connection of the current thread
+        A forked child opens its own, SQLite connections must not be
+        shared with the parent process
+        """
+        conn = getattr(self._local, "connection", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def table(self, cls: type) -> str:
+        """ Create the table of a class if needed and return its name
+        """
+        s_class = cls.__name__
+        if s_class in self.tables:
+            return s_class
+        with self._lock:
+            columns = "".join(
+                ', "{}"'.format(attribute)
+                for attribute in cls.indexed_attributes
+            )
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS "{}" '
+                '(id TEXT PRIMARY KEY, data TEXT NOT NULL{})'.format(
+                    s_class, columns)
+            )
+            for attribute in cls.indexed_attributes:
+                self.connection.execute(
+                    'CREATE INDEX IF NOT EXISTS "{0}_{1}" '
+                    'ON "{0}" ("{1}")'.format(s_class, attribute)
+                )
+            self.tables.add(s_class)
+        return s_class
+
+    def load(self, cls: type):
+        """ Create the table of a class, objects are read on demand
+        """
+        self.table(cls)
+
+    def upsert(self, cls: type) -> str:
+        """ Insert or update statement of the table of a class
+        """
+        table = self.table(cls)
+        columns = ["id", "data"] + list(cls.indexed_attributes)
+        return 'INSERT INTO "{}" ({}) VALUES ({}) ' \
+            'ON CONFLICT(id) DO UPDATE SET {}'.format(
+                table,
+                ", ".join('"{}"'.format(column) for column in columns),
+                ", ".join("?" for _ in columns),
+                ", ".join('"{0}" = excluded."{0}"'.format(column)
+                          for column in columns[1:])
+            )
+
+    @staticmethod
+    def row(obj: Base) -> list:
+        """ Values of the columns of an object
+        """
+        return [obj.id, json.dumps(obj.to_json(True))] + [
+            getattr(obj, attribute, None)
+            for attribute in obj.__class__.indexed_attributes
+        ]
+
+    def save(self, obj: Base):
+        """ Insert or update an object
+        """
+        self.connection.execute(self.upsert(obj.__class__), self.row(obj))
+
+    def save_many(self, cls: type, objs: List[Base]):
+        """ Insert or update many objects in one transaction
+        """
+        statement = self.upsert(cls)
+        conn = self.connection
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(statement, (self.row(obj) for obj in objs))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def remove(self, obj: Base):
+        """ Delete an object
+        """
+        table = self.table(obj.__class__)
+        self.connection.execute(
+            'DELETE FROM "{}" WHERE id = ?'.format(table), (obj.id,)
+        )
+
+    def count(self, cls: type) -> int:
+        """ Count all objects of a class
+        """
+        table = self.table(cls)
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM "{}"'.format(table)
+        ).fetchone()[0]
+
+    def get(self, cls: type, id: str) -> Base:
+        """ Return one object by ID
+        """
+        table = self.table(cls)
+        row = self.connection.execute(
+            'SELECT data FROM "{}" WHERE id = ?'.format(table), (id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return cls(**json.loads(row[0]))
+
+    def search(self, cls: type, attributes: dict) -> List[Base]:
+        """ Search all objects with matching attributes
+        Equality on id or an indexed attribute is done by SQLite
+        """
+        table = self.table(cls)
+        where = []
+        params = []
+        for k, v in attributes.items():
+            if (k == "id" or k in cls.indexed_attributes) and \
+                    (v is None or type(v) in (str, int, float)):
+                where.append('"{}" IS ?'.format(k))
+                params.append(v)
+        query = 'SELECT data FROM "{}"'.format(table)
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY rowid"
+        objs = (
+            cls(**json.loads(row[0]))
+            for row in self.connection.execute(query, params)
+        )
+        return [obj for obj in objs if self.matches(obj, attributes)]
+
+    def page(self, cls: type, limit: int, after: str = None) -> List[Base]:
+        """ Return at most limit objects ordered by ID after the ID after
+        """
+        table = self.table(cls)
+        rows = self.connection.execute(
+            'SELECT data FROM "{}" WHERE id > ? ORDER BY id LIMIT ?'.format(
+                table),
+            ("" if after is None else after, limit)
+        )
+        return [cls(**json.loads(row[0])) for row in rows]
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+""" Main 7
+"""
+import base64
+import time
+from api.v1.auth.basic_auth import BasicAuth
+from models.user import User
+
+
+class FakeRequest():
+    """ Request with only an Authorization header """
+
+    def __init__(self, authorization: str):
+        """ Initialize the headers """
+        self.headers = {"Authorization": authorization}
+
+
+""" Create a user test """
+User.load_from_file()
+user = User()
+user.email = "bob7@hbtn.io"
+user.password = "H0lbertonSchool98!"
+user.save()
+request = FakeRequest("Basic " + base64.b64encode(
+    b"bob7@hbtn.io:H0lbertonSchool98!").decode())
+
+a = BasicAuth()
+print(a.current_user(request).email)
+print(a.current_user(request).email)
+print(a.cache.stats())
+
+""" Repeat callers """
+count = 10000
+for enabled in (False, True):
+    cache = a.cache
+    if not enabled:
+        a.cache = None
+    start = time.perf_counter()
+    for _ in range(count):
+        a.current_user(request)
+    elapsed = (time.perf_counter() - start) / count * 1e6
+    a.cache = cache
+    print("Cache {}: {:.1f}us per request".format(
+        "on" if enabled else "off", elapsed))
+
+""" Email change """
+user.email = "bob7new@hbtn.io"
+user.save()
+print(a.current_user(request))
+user.email = "bob7@hbtn.io"
+user.save()
+print(a.current_user(request).email)
+
+""" Password change and removal """
+user.password = "new password"
+user.save()
+print(a.current_user(request))
+user.password = "H0lbertonSchool98!"
+user.save()
+print(a.current_user(request).email)
+user.remove()
+print(a.current_user(request))
+print(a.cache.stats())
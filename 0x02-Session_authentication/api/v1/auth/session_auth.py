@@ -4,17 +4,27 @@
 """
 import uuid
 from api.v1.auth.auth import Auth
+from api.v1.auth.session_store import session_store
 from models.user import User
 
 
 class SessionAuth(Auth):
     """Performs Session Authentication on the API"""
 
-    user_id_by_session_id = {}
+    session_duration = 0
 
     def __init__(self) -> None:
-        """Initializes the class"""
+        """Initializes the class
+        Sessions are kept in the SessionStore of the process, selected
+        by SESSION_STORE
+        """
         super().__init__()
+        self.sessions = session_store()
+
+    @property
+    def user_id_by_session_id(self) -> dict:
+        """User IDs of the live sessions by Session ID"""
+        return dict(self.sessions.items())
 
     def create_session(self, user_id: str = None) -> str:
         """ Creates a Session ID for a user_id
@@ -26,7 +36,7 @@ class SessionAuth(Auth):
         if user_id is None or not isinstance(user_id, str):
             return None
         session_id = str(uuid.uuid4())
-        self.user_id_by_session_id[session_id] = user_id
+        self.sessions.add(session_id, user_id, self.session_duration)
 
         return session_id
 
@@ -35,12 +45,12 @@ class SessionAuth(Auth):
         Return:
             - None if session_id is None
             - None if session_id is not a string
-            - the User ID for the key session_id in the dictionary
-                user_id_by_session_id otherwise
+            - None if the session expired
+            - the User ID of the session session_id otherwise
         """
         if session_id is None or not isinstance(session_id, str):
             return None
-        return self.user_id_by_session_id.get(session_id)
+        return self.sessions.get(session_id)
 
     def current_user(self, request=None):
         """Returns a User instance based on a cookie value"""
@@ -55,8 +65,4 @@ class SessionAuth(Auth):
         session_id = self.session_cookie(request)
         if session_id is None:
             return False
-        user_id = self.user_id_for_session_id(session_id)
-        if user_id is None:
-            return False
-        del self.user_id_by_session_id[session_id]
-        return True
+        return self.sessions.remove(session_id)
@@ -16,10 +16,17 @@ class SessionDBAuth(SessionExpAuth):
     """
     def create_session(self, user_id=None):
         """Creates and stores a new instance of UserSession
+        Only a shared session store gets the session too, a store local
+        to the process is never read
         Return:
             - Session ID
         """
-        session_id = super().create_session(user_id)
+        if self.sessions.shared:
+            session_id = super().create_session(user_id)
+        elif isinstance(user_id, str):
+            session_id = str(uuid.uuid4())
+        else:
+            session_id = None
         if session_id is None:
             return None
         kwargs = {"user_id": user_id, "session_id": session_id}
@@ -28,9 +35,16 @@ class SessionDBAuth(SessionExpAuth):
 
     def user_id_for_session_id(self, session_id=None):
         """Returns the User ID by requesting UserSession in
-        the database based on session_id"""
+        the database based on session_id
+        A shared session store is checked first and caches the sessions
+        found in the database, a store local to the process is not used
+        so a logout in another process is always seen"""
         if session_id is None:
             return None
+        if self.sessions.shared:
+            user_id = self.sessions.get(session_id)
+            if user_id is not None:
+                return user_id
         try:
             user_sessions = UserSession.search({"session_id": session_id})
             if len(user_sessions) == 0:
@@ -40,10 +54,16 @@ class SessionDBAuth(SessionExpAuth):
         user_id = user_sessions[0].user_id
         created_at = user_sessions[0].created_at
         if self.session_duration <= 0:
+            if self.sessions.shared:
+                self.sessions.add(session_id, user_id)
             return user_id
-        if timedelta(seconds=self.session_duration) + created_at < \
-                datetime.utcnow():
+        remaining = timedelta(seconds=self.session_duration) + created_at - \
+            datetime.utcnow()
+        if remaining < timedelta(0):
             return None
+        if self.sessions.shared and remaining > timedelta(0):
+            self.sessions.add(session_id, user_id,
+                              remaining.total_seconds())
         return user_id
 
     def destroy_session(self, request=None):
@@ -57,13 +77,14 @@ class SessionDBAuth(SessionExpAuth):
         user_id = self.user_id_for_session_id(session_id)
         if user_id is None:
             return False
+        removed = self.sessions.remove(session_id)
         attributes = {"session_id": session_id, "user_id": user_id}
         try:
             user_sessions = UserSession.search(attributes)
             if len(user_sessions) == 0:
-                return False
+                return removed
         except Exception:
-            return False
+            return removed
         for user_session in user_sessions:
             user_session.remove()
         return True
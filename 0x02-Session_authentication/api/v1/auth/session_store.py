@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+""" Session Store Module
+"""
+import heapq
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Tuple
+
+
+STORE = None
+
+
+class SessionStore():
+    """Interface of the stores of the session IDs of SessionAuth
+    A shared store is seen by every process using it
+    """
+
+    shared = False
+
+    def add(self, session_id: str, user_id: str,
+            duration: float = 0) -> None:
+        """Stores a session of user_id lasting duration seconds, forever
+        if duration <= 0
+        """
+        raise NotImplementedError()
+
+    def get(self, session_id: str) -> str:
+        """Returns the user ID of a live session, None otherwise"""
+        raise NotImplementedError()
+
+    def remove(self, session_id: str) -> bool:
+        """Removes a session
+        Return:
+            - True if the session was live
+            - False otherwise
+        """
+        raise NotImplementedError()
+
+    def items(self) -> List[Tuple[str, str]]:
+        """Returns the session IDs and user IDs of the live sessions"""
+        raise NotImplementedError()
+
+    def stats(self) -> dict:
+        """Returns the number of live sessions and of sessions removed
+        because they expired or were evicted
+        """
+        raise NotImplementedError()
+
+
+class MemorySessionStore(SessionStore):
+    """Sessions of one process, removed once they expire
+
+    Expiration times are kept in a min-heap, so expired sessions are
+    removed in O(log n) each, on every call or by a sweeper thread
+    every sweep_interval seconds. When max_sessions (if > 0) sessions
+    are live, adding one evicts the least recently used.
+    """
+
+    def __init__(self, max_sessions: int = 0,
+                 sweep_interval: float = 0) -> None:
+        """Initializes the store"""
+        self.max_sessions = max_sessions
+        self.expired = 0
+        self.evicted = 0
+        self._sessions = OrderedDict()
+        self._expirations = []
+        self._lock = threading.Lock()
+        if sweep_interval > 0:
+            sweeper = threading.Thread(target=self._sweep,
+                                       args=(sweep_interval,), daemon=True)
+            sweeper.start()
+
+    def _sweep(self, interval: float) -> None:
+        """Removes expired sessions every interval seconds"""
+        while True:
+            time.sleep(interval)
+            self.remove_expired()
+
+    def _remove_expired(self, now: float) -> None:
+        """Removes the sessions expired at now, the lock being held"""
+        expirations = self._expirations
+        while expirations and expirations[0][0] < now:
+            expires_at, session_id = heapq.heappop(expirations)
+            entry = self._sessions.get(session_id)
+            if entry is not None and entry[1] == expires_at:
+                del self._sessions[session_id]
+                self.expired += 1
+        # drop the heap entries of removed and evicted sessions
+        if len(expirations) > 2 * len(self._sessions) + 64:
+            self._expirations = [
+                (entry[1], session_id)
+                for session_id, entry in self._sessions.items()
+                if entry[1] is not None
+            ]
+            heapq.heapify(self._expirations)
+
+    def remove_expired(self) -> None:
+        """Removes the expired sessions"""
+        with self._lock:
+            self._remove_expired(time.monotonic())
+
+    def add(self, session_id: str, user_id: str,
+            duration: float = 0) -> None:
+        """Stores a session of user_id lasting duration seconds, forever
+        if duration <= 0
+        """
+        now = time.monotonic()
+        expires_at = now + duration if duration > 0 else None
+        with self._lock:
+            self._remove_expired(now)
+            self._sessions[session_id] = (user_id, expires_at)
+            self._sessions.move_to_end(session_id)
+            if expires_at is not None:
+                heapq.heappush(self._expirations, (expires_at, session_id))
+            while 0 < self.max_sessions < len(self._sessions):
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+
+    def get(self, session_id: str) -> str:
+        """Returns the user ID of a live session, None otherwise"""
+        with self._lock:
+            self._remove_expired(time.monotonic())
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            self._sessions.move_to_end(session_id)
+            return entry[0]
+
+    def remove(self, session_id: str) -> bool:
+        """Removes a session
+        Return:
+            - True if the session was live
+            - False otherwise
+        """
+        with self._lock:
+            self._remove_expired(time.monotonic())
+            return self._sessions.pop(session_id, None) is not None
+
+    def items(self) -> List[Tuple[str, str]]:
+        """Returns the session IDs and user IDs of the live sessions"""
+        with self._lock:
+            self._remove_expired(time.monotonic())
+            return [(session_id, entry[0])
+                    for session_id, entry in self._sessions.items()]
+
+    def __len__(self) -> int:
+        """Returns the number of live sessions"""
+        return len(self._sessions)
+
+    def stats(self) -> dict:
+        """Returns the number of live sessions and of sessions removed
+        because they expired or were evicted
+        """
+        return {"live": len(self._sessions), "expired": self.expired,
+                "evicted": self.evicted}
+
+
+class SQLiteSessionStore(SessionStore):
+    """Sessions in a SQLite database shared by processes
+
+    The database runs in WAL mode so readers never wait for a writer.
+    Expired sessions are deleted, through an index on their expiration
+    time, whenever a session is added. When max_sessions > 0, only the
+    max_sessions most recently created sessions are kept: reads do not
+    update the database, so unlike MemorySessionStore the eviction
+    order is the creation order.
+    """
+
+    shared = True
+
+    def __init__(self, db_path: str, max_sessions: int = 0) -> None:
+        """Initializes the store of the database file db_path"""
+        self.db_path = db_path
+        self.max_sessions = max_sessions
+        self.expired = 0
+        self.evicted = 0
+        self._local = threading.local()
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (session_id TEXT "
+            "PRIMARY KEY, user_id TEXT NOT NULL, expires_at REAL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS sessions_expires_at "
+            "ON sessions (expires_at)"
+        )
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connection of the current thread"""
+        conn = getattr(self._local, "connection", None)
+        # a forked child must not use its parent's connection
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def add(self, session_id: str, user_id: str,
+            duration: float = 0) -> None:
+        """Stores a session of user_id lasting duration seconds, forever
+        if duration <= 0
+        """
+        now = time.time()
+        expires_at = now + duration if duration > 0 else None
+        conn = self.connection
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.expired += conn.execute(
+                "DELETE FROM sessions WHERE expires_at < ?", (now,)
+            ).rowcount
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)",
+                (session_id, user_id, expires_at)
+            )
+            if self.max_sessions > 0:
+                # count the rows: logouts leave gaps in the rowids
+                self.evicted += conn.execute(
+                    "DELETE FROM sessions WHERE rowid IN (SELECT rowid "
+                    "FROM sessions ORDER BY rowid DESC LIMIT -1 OFFSET ?)",
+                    (self.max_sessions,)
+                ).rowcount
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def get(self, session_id: str) -> str:
+        """Returns the user ID of a live session, None otherwise"""
+        row = self.connection.execute(
+            "SELECT user_id FROM sessions WHERE session_id = ? AND "
+            "(expires_at IS NULL OR expires_at >= ?)",
+            (session_id, time.time())
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def remove(self, session_id: str) -> bool:
+        """Removes a session
+        Return:
+            - True if the session was live
+            - False otherwise
+        """
+        return self.connection.execute(
+            "DELETE FROM sessions WHERE session_id = ? AND "
+            "(expires_at IS NULL OR expires_at >= ?)",
+            (session_id, time.time())
+        ).rowcount > 0
+
+    def items(self) -> List[Tuple[str, str]]:
+        """Returns the session IDs and user IDs of the live sessions"""
+        return self.connection.execute(
+            "SELECT session_id, user_id FROM sessions WHERE "
+            "expires_at IS NULL OR expires_at >= ? ORDER BY rowid",
+            (time.time(),)
+        ).fetchall()
+
+    def stats(self) -> dict:
+        """Returns the number of live sessions and of sessions removed
+        by this process because they expired or were evicted
+        """
+        live = self.connection.execute(
+            "SELECT COUNT(*) FROM sessions WHERE "
+            "expires_at IS NULL OR expires_at >= ?", (time.time(),)
+        ).fetchone()[0]
+        return {"live": live, "expired": self.expired,
+                "evicted": self.evicted}
+
+
+def session_store() -> SessionStore:
+    """ Return the session store of the process selected by
+    SESSION_STORE: "sqlite" (database file SESSION_STORE_PATH, shared by
+    processes) or "memory" by default
+    At most SESSION_MAX_COUNT sessions are kept (0 for no limit): by
+    default 100000 in a memory store, no limit in a sqlite store, which
+    evicts in creation order. A memory store also removes expired
+    sessions every SESSION_SWEEP_INTERVAL seconds if it is set
+    """
+    global STORE
+    if STORE is None:
+        shared = os.getenv("SESSION_STORE") == "sqlite"
+        try:
+            max_sessions = int(os.getenv("SESSION_MAX_COUNT",
+                                         0 if shared else 100000))
+            sweep_interval = float(os.getenv("SESSION_SWEEP_INTERVAL", 0))
+        except ValueError:
+            max_sessions = 0 if shared else 100000
+            sweep_interval = 0
+        if shared:
+            STORE = SQLiteSessionStore(
+                os.getenv("SESSION_STORE_PATH", ".db_sessions.sqlite3"),
+                max_sessions
+            )
+        else:
+            STORE = MemorySessionStore(max_sessions, sweep_interval)
+    return STORE
@@ -1,19 +1,64 @@
 #!/usr/bin/env python3
 """ Module of Users views
 """
+import json
+from typing import Iterable
 from api.v1.views import app_views
-from flask import abort, jsonify, request
+from api.v1.fast_json import dumps
+from flask import Response, abort, jsonify, request, stream_with_context
 from models.user import User
 
 
+STREAM_PAGE_SIZE = 1000
+
+
+def stream_users():
+    """ Yield all users as a JSON array, one page of the store at a time
+    """
+    yield "["
+    after = None
+    separator = ""
+    while True:
+        users = User.page(STREAM_PAGE_SIZE, after)
+        for user in users:
+            yield separator + dumps(user.to_json())
+            separator = ","
+        if len(users) < STREAM_PAGE_SIZE:
+            break
+        after = users[-1].id
+    yield "]"
+
+
 @app_views.route('/users', methods=['GET'], strict_slashes=False)
 def view_all_users() -> str:
     """ GET /api/v1/users
+    Query parameters:
+      - limit (optional): page size, users are ordered by ID
+      - after (optional): ID of the last user of the previous page
+      - stream (optional): stream the whole list as it is built
     Return:
       - list of all User objects JSON represented
+      - a page of User objects with a Link header to the next page
+      - 400 if limit is not a positive integer
     """
-    all_users = [user.to_json() for user in User.all()]
-    return jsonify(all_users)
+    if request.args.get("stream"):
+        return Response(stream_with_context(stream_users()),
+                        mimetype="application/json")
+    if "limit" not in request.args and "after" not in request.args:
+        all_users = [user.to_json() for user in User.all()]
+        return jsonify(all_users)
+    try:
+        limit = int(request.args.get("limit", STREAM_PAGE_SIZE))
+    except ValueError:
+        limit = 0
+    if limit <= 0:
+        return jsonify({'error': "limit must be a positive integer"}), 400
+    users = User.page(limit, request.args.get("after"))
+    response = jsonify([user.to_json() for user in users])
+    if len(users) == limit:
+        response.headers["Link"] = '<{}?limit={}&after={}>; rel="next"'.format(
+            request.base_url, limit, users[-1].id)
+    return response
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
@@ -93,6 +138,44 @@ def create_user() -> str:
     return jsonify({'error': error_msg}), 400
 
 
+def ndjson_items(stream) -> Iterable[dict]:
+    """ Parse a stream of one JSON object per line, invalid lines give
+    None
+    """
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+@app_views.route('/users/bulk', methods=['POST'], strict_slashes=False)
+def create_users() -> str:
+    """ POST /api/v1/users/bulk
+    Body: a JSON array, or one JSON object per line with the
+    application/x-ndjson content type, of objects with:
+      - email
+      - password
+      - last_name (optional)
+      - first_name (optional)
+    Return:
+      - the number of created users and the result of each object in
+        order: {"id": ...} or {"error": ...}
+      - 400 if the body isn't a JSON array or NDJSON
+    """
+    if request.mimetype == "application/x-ndjson":
+        items = ndjson_items(request.stream)
+    else:
+        items = request.get_json(silent=True)
+        if not isinstance(items, list):
+            return jsonify({'error': "Wrong format"}), 400
+    results = User.bulk_save(items)
+    created = sum(1 for result in results if "id" in result)
+    return jsonify({'created': created, 'results': results}), 200
+
+
 @app_views.route('/users/<user_id>', methods=['PUT'], strict_slashes=False)
 def update_user(user_id: str = None) -> str:
     """ PUT /api/v1/users/:id
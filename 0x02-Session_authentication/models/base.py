@@ -3,19 +3,195 @@
 """
 from datetime import datetime
 from typing import TypeVar, List, Iterable
-from os import path
+from bisect import bisect_right
+from os import getenv, path
+import atexit
 import json
+import mmap
+import os
+import tempfile
+import threading
 import uuid
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 
 TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+STORAGE_MODE = getenv("STORAGE_MODE", "file")
+LOAD_MODE = getenv("LOAD_MODE", "eager")
+LAZY_SCANNED_MAX = 10000
+JOURNAL_COMPACT_EVERY = int(getenv("JOURNAL_COMPACT_EVERY", 1000))
+WRITE_BEHIND_INTERVAL = float(getenv("WRITE_BEHIND_INTERVAL", 1))
+WRITE_BEHIND_MAX_CHANGES = int(getenv("WRITE_BEHIND_MAX_CHANGES", 100))
 DATA = {}
+INDEXES = {}
+JOURNAL_SIZES = {}
+LAZY = {}
+ORDERED = {}
+FIELDS = {}
+DIRTY = {}
+_DIRTY_LOCK = threading.Lock()
+_FLUSH_LOCK = threading.Lock()
+_FLUSH_EVENT = threading.Event()
+_FLUSHER = None
+STORAGE = None
+_LOCKS = {}
+_LOCKS_GUARD = threading.Lock()
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
+class ClassLock():
+    """ Serialize the writes to a class: re-entrant lock between the
+    threads of the process, flock of .db_<Class>.lock between processes
+    """
+
+    def __init__(self, s_class: str):
+        """ Initialize the lock of s_class
+        """
+        self.s_class = s_class
+        self.lock = threading.RLock()
+        self.depth = 0
+        self.file = None
+
+    def __enter__(self):
+        """ Acquire the lock
+        """
+        self.lock.acquire()
+        if self.depth == 0 and fcntl is not None:
+            self.file = open(".db_{}.lock".format(self.s_class), "a")
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+        self.depth += 1
+        return self
+
+    def __exit__(self, *args):
+        """ Release the lock
+        """
+        self.depth -= 1
+        if self.depth == 0 and self.file is not None:
+            self.file.close()
+            self.file = None
+        self.lock.release()
+
+
+def class_lock(s_class: str) -> ClassLock:
+    """ Return the write lock of a class
+    Readers never lock: they iterate over list() snapshots, which
+    CPython builds atomically
+    """
+    with _LOCKS_GUARD:
+        if s_class not in _LOCKS:
+            _LOCKS[s_class] = ClassLock(s_class)
+        return _LOCKS[s_class]
+
+
+def flush():
+    """ Save to file every class with unsaved changes
+    """
+    with _FLUSH_LOCK:
+        with _DIRTY_LOCK:
+            dirty = list(DIRTY.values())
+            DIRTY.clear()
+        for cls, _ in dirty:
+            cls.save_to_file()
+
+
+def _flusher():
+    """ Flush at most once per WRITE_BEHIND_INTERVAL, or as soon as
+    a class reaches WRITE_BEHIND_MAX_CHANGES changes
+    """
+    while True:
+        _FLUSH_EVENT.wait(WRITE_BEHIND_INTERVAL)
+        _FLUSH_EVENT.clear()
+        flush()
+
+
+atexit.register(flush)
+
+
+def parse_timestamp(value: str) -> datetime:
+    """ Parse a TIMESTAMP_FORMAT string, several times faster than
+    strptime for the fixed format written by to_json
+    """
+    if len(value) == 19 and value[10] == "T":
+        return datetime.fromisoformat(value)
+    return datetime.strptime(value, TIMESTAMP_FORMAT)
+
+
+def format_timestamp(value: datetime) -> str:
+    """ Format a datetime with TIMESTAMP_FORMAT, isoformat is faster
+    than strftime and gives the same result for naive datetimes
+    """
+    if value.tzinfo is None and value.year >= 1000:
+        return value.isoformat(timespec="seconds")
+    return value.strftime(TIMESTAMP_FORMAT)
+
+
+class AttributeIndex():
+    """ Hash index of the saved objects of a class by attribute value
+    A value maps to its only object, or to a dict of objects by id
+    """
+
+    def __init__(self, attribute: str):
+        """ Initialize an empty index on attribute
+        """
+        self.attribute = attribute
+        self.objs = {}
+        self.values = {}
+
+    def add(self, obj: TypeVar('Base')):
+        """ Index obj under its current value
+        """
+        self.discard(obj.id)
+        value = getattr(obj, self.attribute, None)
+        try:
+            bucket = self.objs.get(value)
+        except TypeError:
+            return
+        if bucket is None:
+            self.objs[value] = obj
+        elif type(bucket) is dict:
+            bucket[obj.id] = obj
+        else:
+            self.objs[value] = {bucket.id: bucket, obj.id: obj}
+        self.values[obj.id] = value
+
+    def discard(self, obj_id: str):
+        """ Remove an object from the index
+        """
+        if obj_id not in self.values:
+            return
+        value = self.values.pop(obj_id)
+        bucket = self.objs[value]
+        if type(bucket) is not dict:
+            del self.objs[value]
+            return
+        del bucket[obj_id]
+        if len(bucket) == 1:
+            self.objs[value] = next(iter(bucket.values()))
+
+    def get(self, value) -> List[TypeVar('Base')]:
+        """ Return all objects with attribute equal to value
+        """
+        bucket = self.objs.get(value)
+        if bucket is None:
+            return []
+        if type(bucket) is dict:
+            return list(bucket.values())
+        return [bucket]
 
 
 class Base():
     """ Base class
+    Models declare their attributes in __slots__ so instances carry
+    no __dict__
     """
 
+    __slots__ = ("id", "created_at", "updated_at")
+    indexed_attributes = ()
+
     def __init__(self, *args: list, **kwargs: dict):
         """ Initialize a Base instance
         """
@@ -25,13 +201,11 @@ class Base():
 
         self.id = kwargs.get('id', str(uuid.uuid4()))
         if kwargs.get('created_at') is not None:
-            self.created_at = datetime.strptime(kwargs.get('created_at'),
-                                                TIMESTAMP_FORMAT)
+            self.created_at = parse_timestamp(kwargs.get('created_at'))
         else:
             self.created_at = datetime.utcnow()
         if kwargs.get('updated_at') is not None:
-            self.updated_at = datetime.strptime(kwargs.get('updated_at'),
-                                                TIMESTAMP_FORMAT)
+            self.updated_at = parse_timestamp(kwargs.get('updated_at'))
         else:
             self.updated_at = datetime.utcnow()
 
@@ -44,33 +218,183 @@ class Base():
             return False
         return (self.id == other.id)
 
+    @classmethod
+    def json_fields(cls, for_serialization: bool = False) -> tuple:
+        """ Names of the attributes read by to_json: the __slots__ of
+        the class and its parents, computed once per class
+        """
+        key = (cls, for_serialization)
+        fields = FIELDS.get(key)
+        if fields is None:
+            names = []
+            for klass in reversed(cls.__mro__):
+                names.extend(klass.__dict__.get("__slots__", ()))
+            fields = tuple(
+                name for name in names
+                if for_serialization or name[0] != '_'
+            )
+            FIELDS[key] = fields
+        return fields
+
     def to_json(self, for_serialization: bool = False) -> dict:
         """ Convert the object a JSON dictionary
         """
+        names = self.json_fields(for_serialization)
+        extra = getattr(self, "__dict__", None)
+        if extra:
+            names += tuple(
+                key for key in extra if for_serialization or key[0] != '_'
+            )
         result = {}
-        for key, value in self.__dict__.items():
-            if not for_serialization and key[0] == '_':
+        for key in names:
+            try:
+                value = getattr(self, key)
+            except AttributeError:
                 continue
             if type(value) is datetime:
-                result[key] = value.strftime(TIMESTAMP_FORMAT)
+                result[key] = format_timestamp(value)
             else:
                 result[key] = value
         return result
 
     @classmethod
     def load_from_file(cls):
-        """ Load all objects from file
+        """ Load all objects from storage
+        """
+        storage().load(cls)
+
+    @classmethod
+    def map_file(cls, file_path: str) -> bool:
+        """ Memory-map a file written by save_to_file and only record
+        where each object is, objects are built by materialize
+        Return: False if the file is not one object per line
+        """
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:2] != b"{\n":
+            mm.close()
+            return False
+
+        offsets = {}
+        start = 2
+        size = len(mm)
+        while start < size:
+            end = mm.find(b"\n", start)
+            if end == -1:
+                end = size
+            if mm[start:start + 1] == b'"':
+                sep = mm.find(b'": ', start, end)
+                value_end = end - 1 if mm[end - 1:end] == b"," else end
+                offsets[json.loads(mm[start:sep + 1])] = (sep + 3, value_end)
+            start = end + 1
+        LAZY[cls.__name__] = (mm, offsets, set())
+        return True
+
+    @classmethod
+    def lazy_ids(cls, attributes: dict = {}) -> List[str]:
+        """ IDs of the objects not built yet which may match attributes
+        A string attribute stored under its own name is looked up as raw
+        JSON in the mapped file, once: its matches are built and indexed
+        afterwards. Otherwise every object may match
+        """
+        mm, offsets, scanned = LAZY[cls.__name__]
+        stored = cls.json_fields(True)
+        for k, v in attributes.items():
+            if type(v) is not str or k not in stored:
+                continue
+            if (k, v) in scanned:
+                return []
+            if len(scanned) >= LAZY_SCANNED_MAX:
+                scanned.clear()
+            scanned.add((k, v))
+            needle = "{}: {}".format(json.dumps(k), json.dumps(v)).encode()
+            obj_ids = []
+            pos = mm.find(needle)
+            while pos != -1:
+                start = mm.rfind(b"\n", 0, pos) + 1
+                sep = mm.find(b'": ', start, pos)
+                if sep != -1:
+                    obj_ids.append(json.loads(mm[start:sep + 1]))
+                pos = mm.find(needle, pos + 1)
+            return [obj_id for obj_id in obj_ids if obj_id in offsets]
+        return list(offsets)
+
+    @classmethod
+    def materialize(cls, obj_ids: Iterable[str]):
+        """ Build the objects of a lazily loaded file
         """
         s_class = cls.__name__
-        file_path = ".db_{}.json".format(s_class)
-        DATA[s_class] = {}
-        if not path.exists(file_path):
+        if s_class not in LAZY:
             return
+        mm, offsets, _ = LAZY[s_class]
+        indexes = cls.indexes().values()
+        for obj_id in obj_ids:
+            offset = offsets.pop(obj_id, None)
+            if offset is None:
+                continue
+            obj = cls(**json.loads(mm[offset[0]:offset[1]]))
+            DATA[s_class][obj_id] = obj
+            for index in indexes:
+                index.add(obj)
 
-        with open(file_path, 'r') as f:
-            objs_json = json.load(f)
-            for obj_id, obj_json in objs_json.items():
-                DATA[s_class][obj_id] = cls(**obj_json)
+    @classmethod
+    def replay_journal(cls):
+        """ Apply the journal records written since the last snapshot
+        """
+        s_class = cls.__name__
+        journal_path = ".db_{}.journal".format(s_class)
+        JOURNAL_SIZES[s_class] = 0
+        if not path.exists(journal_path):
+            return
+
+        torn = False
+        with open(journal_path, 'r') as f:
+            for line in f:
+                # a record is only written once its newline is, and a
+                # line without one would get the next append glued to it
+                if not line.endswith("\n"):
+                    torn = True
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    torn = True
+                    continue
+                if s_class in LAZY:
+                    LAZY[s_class][1].pop(record["id"], None)
+                if record["op"] == "save":
+                    DATA[s_class][record["id"]] = cls(**record["obj"])
+                else:
+                    DATA[s_class].pop(record["id"], None)
+                JOURNAL_SIZES[s_class] += 1
+        # drop a write interrupted by a crash before appending more, and
+        # fold the journal in the snapshot when it is no longer used
+        if torn or (JOURNAL_SIZES[s_class] and STORAGE_MODE != "journal"):
+            cls.compact()
+
+    @classmethod
+    def indexes(cls) -> dict:
+        """ Return the indexes of the class by attribute
+        """
+        s_class = cls.__name__
+        if INDEXES.get(s_class) is None:
+            INDEXES[s_class] = {
+                attribute: AttributeIndex(attribute)
+                for attribute in cls.indexed_attributes
+            }
+        return INDEXES[s_class]
+
+    @classmethod
+    def reindex(cls):
+        """ Rebuild the indexes from all objects
+        """
+        s_class = cls.__name__
+        INDEXES.pop(s_class, None)
+        for index in cls.indexes().values():
+            for obj in DATA.get(s_class, {}).values():
+                index.add(obj)
 
     @classmethod
     def save_to_file(cls):
@@ -78,35 +402,136 @@ class Base():
         """
         s_class = cls.__name__
         file_path = ".db_{}.json".format(s_class)
-        objs_json = {}
-        for obj_id, obj in DATA[s_class].items():
-            objs_json[obj_id] = obj.to_json(True)
+        with class_lock(s_class):
+            # one object per line, so the file can be loaded lazily
+            lines = []
+            if s_class in LAZY:
+                mm, offsets, _ = LAZY[s_class]
+                for obj_id, (start, end) in offsets.items():
+                    lines.append(json.dumps(obj_id).encode() + b": " +
+                                 mm[start:end])
+            for obj_id, obj in DATA[s_class].items():
+                lines.append("{}: {}".format(
+                    json.dumps(obj_id), json.dumps(obj.to_json(True))
+                ).encode())
 
-        with open(file_path, 'w') as f:
-            json.dump(objs_json, f)
+            # write a temporary file then rename it over the old one, so
+            # a crash never leaves a truncated file behind
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=file_path + ".",
+                dir=path.dirname(path.abspath(file_path))
+            )
+            try:
+                # mkstemp creates the file 0600, keep the mode of the
+                # file it replaces (or the default one for a new file)
+                try:
+                    mode = os.stat(file_path).st_mode & 0o7777
+                except FileNotFoundError:
+                    mode = 0o666 & ~UMASK
+                with os.fdopen(fd, 'wb') as f:
+                    os.fchmod(f.fileno(), mode)
+                    f.write(b"{\n" + b",\n".join(lines) + b"\n}")
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, file_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+
+    @classmethod
+    def mark_dirty(cls):
+        """ Record a change to be saved to file by the write-behind
+        flusher thread
+        """
+        global _FLUSHER
+        s_class = cls.__name__
+        with _DIRTY_LOCK:
+            changes = DIRTY.get(s_class, (cls, 0))[1] + 1
+            DIRTY[s_class] = (cls, changes)
+            if _FLUSHER is None:
+                _FLUSHER = threading.Thread(target=_flusher, daemon=True)
+                _FLUSHER.start()
+        if changes >= WRITE_BEHIND_MAX_CHANGES:
+            _FLUSH_EVENT.set()
+
+    @classmethod
+    def append_to_journal(cls, op: str, obj: TypeVar('Base')):
+        """ Append one save/remove record to the journal, compacting
+        it into a snapshot every JOURNAL_COMPACT_EVERY records
+        """
+        s_class = cls.__name__
+        journal_path = ".db_{}.journal".format(s_class)
+        record = {"op": op, "id": obj.id}
+        if op == "save":
+            record["obj"] = obj.to_json(True)
+        with class_lock(s_class):
+            with open(journal_path, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+            JOURNAL_SIZES[s_class] = JOURNAL_SIZES.get(s_class, 0) + 1
+            if JOURNAL_SIZES[s_class] >= JOURNAL_COMPACT_EVERY:
+                cls.compact()
+
+    @classmethod
+    def compact(cls):
+        """ Write a snapshot of all objects and empty the journal
+        """
+        s_class = cls.__name__
+        journal_path = ".db_{}.journal".format(s_class)
+        with class_lock(s_class):
+            cls.save_to_file()
+            open(journal_path, 'w').close()
+            JOURNAL_SIZES[s_class] = 0
+
+    def persist(self, op: str):
+        """ Write a save/remove of the object to storage
+        In "journal" STORAGE_MODE only the change is appended, in
+        "write_behind" the class is saved later by the flusher thread,
+        otherwise the whole class is saved to file right away
+        """
+        if STORAGE_MODE == "journal":
+            self.__class__.append_to_journal(op, self)
+        elif STORAGE_MODE == "write_behind":
+            self.__class__.mark_dirty()
+        else:
+            self.__class__.save_to_file()
+
+    @classmethod
+    def persist_all(cls):
+        """ Write all objects of the class to storage at once, after a
+        bulk change
+        """
+        if STORAGE_MODE == "journal":
+            cls.compact()
+        elif STORAGE_MODE == "write_behind":
+            cls.mark_dirty()
+        else:
+            cls.save_to_file()
 
     def save(self):
         """ Save current object
         """
-        s_class = self.__class__.__name__
         self.updated_at = datetime.utcnow()
-        DATA[s_class][self.id] = self
-        self.__class__.save_to_file()
+        storage().save(self)
+
+    @classmethod
+    def save_many(cls, objs: List[TypeVar('Base')]):
+        """ Save many objects, persisted once instead of once per object
+        """
+        now = datetime.utcnow()
+        for obj in objs:
+            obj.updated_at = now
+        storage().save_many(cls, objs)
 
     def remove(self):
         """ Remove object
         """
-        s_class = self.__class__.__name__
-        if DATA[s_class].get(self.id) is not None:
-            del DATA[s_class][self.id]
-            self.__class__.save_to_file()
+        storage().remove(self)
 
     @classmethod
     def count(cls) -> int:
         """ Count all objects
         """
-        s_class = cls.__name__
-        return len(DATA[s_class].keys())
+        return storage().count(cls)
 
     @classmethod
     def all(cls) -> Iterable[TypeVar('Base')]:
@@ -118,20 +543,208 @@ class Base():
     def get(cls, id: str) -> TypeVar('Base'):
         """ Return one object by ID
         """
-        s_class = cls.__name__
-        return DATA[s_class].get(id)
+        return storage().get(cls, id)
 
     @classmethod
     def search(cls, attributes: dict = {}) -> List[TypeVar('Base')]:
         """ Search all objects with matching attributes
         """
+        return storage().search(cls, attributes)
+
+    @classmethod
+    def page(cls, limit: int, after: str = None) -> List[TypeVar('Base')]:
+        """ Return at most limit objects ordered by ID, starting after
+        the ID after
+        """
+        return storage().page(cls, limit, after)
+
+
+class Storage():
+    """ Interface of the storage backends behind Base
+    """
+
+    def load(self, cls: type):
+        """ Prepare the storage of a class
+        """
+        raise NotImplementedError()
+
+    def save(self, obj: Base):
+        """ Insert or update an object
+        """
+        raise NotImplementedError()
+
+    def save_many(self, cls: type, objs: List[Base]):
+        """ Insert or update many objects of a class
+        """
+        for obj in objs:
+            self.save(obj)
+
+    def remove(self, obj: Base):
+        """ Delete an object
+        """
+        raise NotImplementedError()
+
+    def count(self, cls: type) -> int:
+        """ Count all objects of a class
+        """
+        raise NotImplementedError()
+
+    def get(self, cls: type, id: str) -> Base:
+        """ Return one object by ID
+        """
+        raise NotImplementedError()
+
+    def search(self, cls: type, attributes: dict) -> List[Base]:
+        """ Search all objects with matching attributes
+        """
+        raise NotImplementedError()
+
+    def page(self, cls: type, limit: int, after: str = None) -> List[Base]:
+        """ Return at most limit objects ordered by ID after the ID after
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    def matches(obj: Base, attributes: dict) -> bool:
+        """ Check that obj has all attributes
+        """
+        for k, v in attributes.items():
+            if (getattr(obj, k) != v):
+                return False
+        return True
+
+
+class FileStorage(Storage):
+    """ Objects kept in DATA and saved to .db_<Class>.json files
+    """
+
+    def load(self, cls: type):
+        """ Load all objects from file
+        """
+        s_class = cls.__name__
+        file_path = ".db_{}.json".format(s_class)
+        if s_class in DIRTY:
+            flush()
+        with class_lock(s_class):
+            DATA[s_class] = {}
+            INDEXES.pop(s_class, None)
+            LAZY.pop(s_class, None)
+            ORDERED.pop(s_class, None)
+            if path.exists(file_path) and \
+                    not (LOAD_MODE == "lazy" and cls.map_file(file_path)):
+                with open(file_path, 'r') as f:
+                    objs_json = json.load(f)
+                    for obj_id, obj_json in objs_json.items():
+                        DATA[s_class][obj_id] = cls(**obj_json)
+            cls.replay_journal()
+            cls.reindex()
+
+    def save(self, obj: Base):
+        """ Save an object in DATA and to file
+        """
+        s_class = obj.__class__.__name__
+        with class_lock(s_class):
+            if obj.id not in DATA[s_class]:
+                ORDERED.pop(s_class, None)
+            DATA[s_class][obj.id] = obj
+            for index in obj.__class__.indexes().values():
+                index.add(obj)
+            obj.persist("save")
+
+    def save_many(self, cls: type, objs: List[Base]):
+        """ Save many objects in DATA and write the file once
+        """
+        if not objs:
+            return
+        s_class = cls.__name__
+        with class_lock(s_class):
+            ORDERED.pop(s_class, None)
+            indexes = cls.indexes().values()
+            for obj in objs:
+                DATA[s_class][obj.id] = obj
+                for index in indexes:
+                    index.add(obj)
+            cls.persist_all()
+
+    def remove(self, obj: Base):
+        """ Remove an object from DATA and file
+        """
+        s_class = obj.__class__.__name__
+        with class_lock(s_class):
+            if DATA[s_class].get(obj.id) is not None:
+                del DATA[s_class][obj.id]
+                ORDERED.pop(s_class, None)
+                for index in obj.__class__.indexes().values():
+                    index.discard(obj.id)
+                obj.persist("remove")
+
+    def count(self, cls: type) -> int:
+        """ Count all objects
+        """
+        s_class = cls.__name__
+        if s_class in LAZY:
+            return len(DATA[s_class].keys()) + len(LAZY[s_class][1])
+        return len(DATA[s_class].keys())
+
+    def get(self, cls: type, id: str) -> Base:
+        """ Return one object by ID
+        """
+        s_class = cls.__name__
+        if s_class in LAZY and DATA[s_class].get(id) is None:
+            with class_lock(s_class):
+                cls.materialize([id])
+        return DATA[s_class].get(id)
+
+    def search(self, cls: type, attributes: dict) -> List[Base]:
+        """ Search all objects with matching attributes
+        Equality on an indexed attribute is answered from its index
+        """
+        s_class = cls.__name__
+        if s_class in LAZY:
+            with class_lock(s_class):
+                cls.materialize(cls.lazy_ids(attributes))
+
+        objs = None
+        indexes = cls.indexes()
+        for k, v in attributes.items():
+            if k in indexes:
+                try:
+                    objs = indexes[k].get(v)
+                    break
+                except TypeError:
+                    continue
+        if objs is None:
+            objs = list(DATA[s_class].values())
+        return [obj for obj in objs if self.matches(obj, attributes)]
+
+    def page(self, cls: type, limit: int, after: str = None) -> List[Base]:
+        """ Return at most limit objects ordered by ID after the ID after
+        The sorted IDs are cached until an object is added or removed
+        """
         s_class = cls.__name__
-        def _search(obj):
-            if len(attributes) == 0:
-                return True
-            for k, v in attributes.items():
-                if (getattr(obj, k) != v):
-                    return False
-            return True
-        
-        return list(filter(_search, DATA[s_class].values()))
+        obj_ids = ORDERED.get(s_class)
+        if obj_ids is None:
+            with class_lock(s_class):
+                obj_ids = list(DATA[s_class])
+                if s_class in LAZY:
+                    obj_ids.extend(LAZY[s_class][1])
+                obj_ids.sort()
+                ORDERED[s_class] = obj_ids
+        start = 0 if after is None else bisect_right(obj_ids, after)
+        objs = [self.get(cls, obj_id)
+                for obj_id in obj_ids[start:start + limit]]
+        return [obj for obj in objs if obj is not None]
+
+
+def storage() -> Storage:
+    """ Return the storage backend selected by STORAGE_BACKEND:
+    "sqlite" (database file SQLITE_PATH) or "file" by default
+    """
+    global STORAGE
+    if STORAGE is None:
+        if getenv("STORAGE_BACKEND") == "sqlite":
+            from models.sqlite_storage import SQLiteStorage
+            STORAGE = SQLiteStorage(getenv("SQLITE_PATH", ".db.sqlite3"))
+        else:
+            STORAGE = FileStorage()
+    return STORAGE
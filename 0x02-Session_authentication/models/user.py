@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """ User module
 """
+from typing import Iterable, List
 import hashlib
 from models.base import Base
 
@@ -9,6 +10,9 @@ class User(Base):
     """ User class
     """
 
+    __slots__ = ("email", "_password", "first_name", "last_name")
+    indexed_attributes = ("email",)
+
     def __init__(self, *args: list, **kwargs: dict):
         """ Initialize a User instance
         """
@@ -33,6 +37,39 @@ class User(Base):
         else:
             self._password = hashlib.sha256(pwd.encode()).hexdigest().lower()
 
+    @classmethod
+    def bulk_save(cls, items: Iterable[dict]) -> List[dict]:
+        """ Create a user for each dictionary of items (email, password,
+        first_name and last_name) and save them all at once
+        Return the result of each item in order: {"id": ...} or
+        {"error": ...}
+        """
+        results = []
+        users = []
+        for item in items:
+            if not isinstance(item, dict):
+                error = "Wrong format"
+            elif item.get("email", "") == "":
+                error = "email missing"
+            elif item.get("password", "") == "":
+                error = "password missing"
+            else:
+                try:
+                    user = cls()
+                    user.email = item.get("email")
+                    user.password = item.get("password")
+                    user.first_name = item.get("first_name")
+                    user.last_name = item.get("last_name")
+                except Exception as e:
+                    error = "Can't create User: {}".format(e)
+                else:
+                    users.append(user)
+                    results.append({"id": user.id})
+                    continue
+            results.append({"error": error})
+        cls.save_many(users)
+        return results
+
     def is_valid_password(self, pwd: str) -> bool:
         """ Validate a password
         """
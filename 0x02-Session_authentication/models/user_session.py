@@ -7,6 +7,9 @@ from models.base import Base
 class UserSession(Base):
     """User Session class"""
 
+    __slots__ = ("user_id", "session_id")
+    indexed_attributes = ("session_id",)
+
     def __init__(self, *args: list, **kwargs: dict):
         """ Initialize a User Session instance
         """
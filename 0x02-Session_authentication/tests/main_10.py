@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+""" Main 10
+"""
+import random
+import time
+from api.v1.auth.auth import Auth, PathMatcher
+
+
+def linear_require_auth(path: str, excluded_paths: list) -> bool:
+    """ require_auth before the compiled matcher """
+    if path is None:
+        return True
+    if excluded_paths is None or excluded_paths == []:
+        return True
+    if not path.endswith('/'):
+        path += '/'
+    if path in excluded_paths:
+        return False
+    for ex_path in excluded_paths:
+        if ex_path.endswith("*") and path.startswith(ex_path[:-1]):
+            return False
+    return True
+
+
+""" A few hundred public routes, a third of them wildcards """
+random.seed(10)
+excluded_paths = []
+for i in range(300):
+    ex_path = "/api/v1/public{}/res{}/".format(i % 37, i)
+    excluded_paths.append(ex_path[:-1] + "*" if i % 3 == 0 else ex_path)
+paths = [random.choice([
+    "/api/v1/users/{}".format(i),
+    "/api/v1/public{}/res{}".format(i % 37, i),
+    "/api/v1/public{}/res{}/x/y".format(i % 37, i),
+    "/api/v1/public{}/res{}1".format(i % 37, i),
+]) for i in range(300)]
+
+a = Auth()
+matcher = PathMatcher(excluded_paths)
+mismatches = [path for path in paths + [None, "/", ""]
+              if a.require_auth(path, matcher) !=
+              linear_require_auth(path, excluded_paths)]
+print("Mismatches: {}".format(mismatches))
+print(a.require_auth("/api/v1/status", ["/api/v1/stat*"]))
+print(a.require_auth("/api/v1/users", ["/api/v1/stat*"]))
+
+count = 20
+for name, fn, arg in (("linear", linear_require_auth, excluded_paths),
+                      ("list", a.require_auth, excluded_paths),
+                      ("compiled", a.require_auth, matcher)):
+    start = time.perf_counter()
+    for _ in range(count):
+        for path in paths:
+            fn(path, arg)
+    elapsed = (time.perf_counter() - start) / count / len(paths) * 1e6
+    print("{}: {:.2f}us per path".format(name, elapsed))
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+""" Main 11
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+os.environ["SESSION_DURATION"] = "3"
+os.environ["SESSION_MAX_COUNT"] = "10000"
+from api.v1.auth.session_exp_auth import SessionExpAuth
+
+sa = SessionExpAuth()
+session_id = sa.create_session("user-1")
+print(sa.user_id_for_session_id(session_id))
+
+""" Sessions above the cap evict the least recently used """
+tracemalloc.start()
+for i in range(30000):
+    sa.create_session("user-{}".format(i))
+    sa.user_id_for_session_id(session_id)
+current, _ = tracemalloc.get_traced_memory()
+print(sa.sessions.stats())
+print("Memory: {:.0f} KB".format(current / 1024))
+print(sa.user_id_for_session_id(session_id))
+
+""" Expired sessions are removed by the next call """
+time.sleep(3.1)
+start = time.perf_counter()
+print(sa.user_id_for_session_id(session_id))
+print("Expired 10000 sessions in {:.1f}ms".format(
+    (time.perf_counter() - start) * 1000))
+print(sa.sessions.stats())
+
+""" A shared store only evicts once the cap is reached """
+from api.v1.auth.session_store import SQLiteSessionStore
+
+path = os.path.join(tempfile.mkdtemp(), "sessions.sqlite3")
+store = SQLiteSessionStore(path, max_sessions=100)
+store.add("session-a", "user-a")
+for i in range(99):
+    store.add("session-{}".format(i), "user-{}".format(i))
+for i in range(98):
+    store.remove("session-{}".format(i))
+store.add("session-new", "user-new")
+print(store.get("session-a"), store.stats())
+for i in range(100):
+    store.add("session-{}".format(i), "user-{}".format(i))
+print(store.get("session-a"), store.stats())
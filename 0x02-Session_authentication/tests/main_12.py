@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+""" Main 12
+"""
+import multiprocessing
+import os
+import sys
+
+os.environ["SESSION_NAME"] = "_my_session_id"
+os.environ["SESSION_DURATION"] = "60"
+os.environ.setdefault("SESSION_STORE", sys.argv[1] if len(sys.argv) > 1
+                      else "sqlite")
+os.environ.setdefault("AUTH_TYPE", sys.argv[2] if len(sys.argv) > 2
+                      else "session_exp_auth")
+if os.environ["AUTH_TYPE"] == "session_db_auth":
+    # UserSession objects must be shared by the workers too
+    os.environ["STORAGE_BACKEND"] = "sqlite"
+
+
+def worker(requests, responses) -> None:
+    """ An API worker process answering the requests of the queue """
+    from api.v1.app import app
+    client = app.test_client(use_cookies=False)
+    for method, path, kwargs in iter(requests.get, None):
+        response = getattr(client, method)(path, **kwargs)
+        session_id = None
+        for header in response.headers.getlist("Set-Cookie"):
+            if header.startswith(os.environ["SESSION_NAME"] + "="):
+                session_id = header.split(";")[0].split("=", 1)[1]
+        responses.put((response.status_code, response.get_json(),
+                       session_id))
+
+
+def call(n: int, method: str, path: str, **kwargs) -> tuple:
+    """ Send a request to the worker n and wait for its response """
+    queues[n][0].put((method, path, kwargs))
+    return queues[n][1].get()
+
+
+if __name__ == "__main__":
+    from models.user import User
+
+    """ Create a user test """
+    for db in (".db_sessions.sqlite3", ".db.sqlite3"):
+        for path in (db, db + "-wal", db + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+    User.load_from_file()
+    user = User()
+    user.email = "bob12@hbtn.io"
+    user.password = "pwd12"
+    user.save()
+
+    """ Two workers """
+    context = multiprocessing.get_context("spawn")
+    queues = [(context.Queue(), context.Queue()) for _ in range(2)]
+    workers = [context.Process(target=worker, args=queue)
+               for queue in queues]
+    for process in workers:
+        process.start()
+
+    print("Store: {}, {}".format(os.environ["SESSION_STORE"],
+                                 os.environ["AUTH_TYPE"]))
+
+    def login(n: int) -> dict:
+        """ Log in on the worker n and return the session cookie """
+        status, _, session_id = call(n, "post", "/api/v1/auth_session/login",
+                                     data={"email": "bob12@hbtn.io",
+                                           "password": "pwd12"})
+        print("Login on worker {}: {}".format(n, status))
+        return {"Cookie": "_my_session_id={}".format(session_id)}
+
+    def me(n: int, cookie: dict) -> None:
+        """ Print the user the worker n authenticates """
+        status, body, _ = call(n, "get", "/api/v1/users/me",
+                               headers=cookie)
+        print("Me on worker {}: {} {}".format(
+            n, status, body.get("email", body.get("error"))))
+
+    def logout(n: int, cookie: dict) -> None:
+        """ Log out on the worker n """
+        status, _, _ = call(n, "delete", "/api/v1/auth_session/logout",
+                            headers=cookie)
+        print("Logout on worker {}: {}".format(n, status))
+
+    """ Log out on the worker that did not log in """
+    cookie = login(0)
+    me(0, cookie)
+    me(1, cookie)
+    logout(1, cookie)
+    me(0, cookie)
+
+    """ Log out on the worker that logged in, after the other one
+    authenticated the session """
+    cookie = login(0)
+    me(1, cookie)
+    logout(0, cookie)
+    me(1, cookie)
+
+    for n, process in enumerate(workers):
+        queues[n][0].put(None)
+        process.join()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+""" Main 13
+"""
+import os
+
+os.environ["STORAGE_BACKEND"] = "sqlite"
+os.environ["SQLITE_PATH"] = ".db_main_13.sqlite3"
+for path in (".db_main_13.sqlite3", ".db_main_13.sqlite3-wal",
+             ".db_main_13.sqlite3-shm"):
+    if os.path.exists(path):
+        os.remove(path)
+from models.base import storage
+from models.user import User
+
+""" Save and search """
+User.load_from_file()
+print(type(storage()).__name__)
+users = []
+for i in range(10):
+    user = User(email="user{}@hbtn.io".format(i), first_name="Bob")
+    user.password = "pwd{}".format(i)
+    user.save()
+    users.append(user)
+print("Count: {}".format(User.count()))
+found = User.search({"email": "user3@hbtn.io"})
+print(len(found), found[0].id == users[3].id,
+      found[0].is_valid_password("pwd3"))
+print(len(User.search({"first_name": "Bob"})))
+users[3].last_name = "Dylan"
+users[3].save()
+print(User.get(users[3].id).display_name(), User.count())
+
+""" Page by ID """
+ids = sorted(user.id for user in users)
+page = User.page(4)
+print([user.id for user in page] == ids[:4])
+page = User.page(4, after=page[-1].id)
+print([user.id for user in page] == ids[4:8])
+print(len(User.page(4, after=ids[-1])))
+
+""" Remove """
+users[0].remove()
+print(User.get(users[0].id), User.count())
+
+""" A forked child uses its own connection """
+parent_connection = storage().connection
+pid = os.fork()
+if pid == 0:
+    if storage().connection is parent_connection:
+        os._exit(2)
+    user = User(email="child@hbtn.io")
+    user.save()
+    os._exit(0 if len(User.search({"email": "child@hbtn.io"})) == 1 else 1)
+_, status = os.waitpid(pid, 0)
+print("Child: {}".format(status), User.count())
+print(len(User.search({"email": "child@hbtn.io"})))
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+""" Main 14
+"""
+import json
+import os
+
+os.environ["STORAGE_MODE"] = "journal"
+os.environ["JOURNAL_COMPACT_EVERY"] = "10"
+for path in (".db_User.json", ".db_User.journal"):
+    if os.path.exists(path):
+        os.remove(path)
+from models.user import User
+
+
+def journal_lines() -> int:
+    """ Number of records in the journal """
+    with open(".db_User.journal") as f:
+        return len(f.readlines())
+
+
+""" Saves are appended to the journal and replayed on load """
+User.load_from_file()
+users = []
+for i in range(5):
+    user = User(email="user{}@hbtn.io".format(i))
+    user.save()
+    users.append(user)
+users[0].remove()
+print("Journal: {}, snapshot: {}".format(
+    journal_lines(), os.path.exists(".db_User.json")))
+User.load_from_file()
+print("Users: {}".format(User.count()))
+
+""" Every 10 records the journal is folded into the snapshot """
+for i in range(5, 12):
+    User(email="user{}@hbtn.io".format(i)).save()
+print("Journal: {}, snapshot: {}".format(
+    journal_lines(), os.path.exists(".db_User.json")))
+User.load_from_file()
+print("Users: {}".format(User.count()))
+
+""" A record torn before its newline is dropped, later appends are kept
+"""
+torn = User(email="torn@hbtn.io")
+with open(".db_User.journal", "a") as f:
+    f.write(json.dumps({"op": "save", "id": torn.id,
+                        "obj": torn.to_json(True)}))
+User.load_from_file()
+print("Torn: {}, journal: {}".format(
+    User.get(torn.id), journal_lines()))
+User(email="after@hbtn.io").save()
+User.load_from_file()
+print("Users: {}, after: {}".format(
+    User.count(), len(User.search({"email": "after@hbtn.io"}))))
+
+""" A corrupt record does not drop the records after it """
+later = User(email="later@hbtn.io")
+with open(".db_User.journal", "a") as f:
+    f.write('{"op": "save", "id": \n')
+    f.write(json.dumps({"op": "save", "id": later.id,
+                        "obj": later.to_json(True)}) + "\n")
+User.load_from_file()
+print("Users: {}, later: {}, journal: {}".format(
+    User.count(), User.get(later.id) is not None, journal_lines()))
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+""" Main 15
+"""
+import importlib
+import json
+import os
+import re
+
+for path in (".db_User.json", ".db_User.journal"):
+    if os.path.exists(path):
+        os.remove(path)
+from models.user import User
+from api.v1 import app as api
+
+views = importlib.import_module("api.v1.views.users")
+views.STREAM_PAGE_SIZE = 7
+api.auth = None
+client = api.app.test_client()
+
+""" Create users test """
+User.load_from_file()
+ids = []
+for i in range(25):
+    user = User(email="user{}@hbtn.io".format(i))
+    user.password = "pwd{}".format(i)
+    user.save()
+    ids.append(user.id)
+ids.sort()
+
+""" Page through the users with limit and after """
+paged = []
+path = "/api/v1/users?limit=10"
+while path is not None:
+    response = client.get(path)
+    page = [user["id"] for user in response.get_json()]
+    paged.extend(page)
+    link = response.headers.get("Link")
+    print("{} users, next: {}".format(len(page), link is not None))
+    path = None
+    if link is not None:
+        path = re.match(r'<http://localhost([^>]*)>; rel="next"',
+                        link).group(1)
+print("All users in order: {}".format(paged == ids))
+response = client.get("/api/v1/users?after={}".format(ids[20]))
+print(len(response.get_json()))
+
+""" A bad limit is rejected """
+for limit in ("x", "0", "-1"):
+    response = client.get("/api/v1/users?limit={}".format(limit))
+    print(response.status_code, response.get_json())
+
+""" Stream the whole list, over several store pages """
+response = client.get("/api/v1/users?stream=1")
+streamed = json.loads(response.get_data(as_text=True))
+print(response.status_code, response.mimetype,
+      [user["id"] for user in streamed] == ids,
+      all("_password" not in user for user in streamed))
+response = client.get("/api/v1/users")
+print(len(response.get_json()))
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+""" Main 16
+"""
+import json
+import os
+
+for path in (".db_User.json", ".db_User.journal"):
+    if os.path.exists(path):
+        os.remove(path)
+from models.user import User
+from api.v1 import app as api
+
+api.auth = None
+client = api.app.test_client()
+User.load_from_file()
+
+""" JSON array, one result per item in order """
+response = client.post("/api/v1/users/bulk", json=[
+    {"email": "a@hbtn.io", "password": "pwd", "first_name": "Ann"},
+    {"email": "", "password": "pwd"},
+    {"email": "b@hbtn.io"},
+    "not an object",
+    {"email": "c@hbtn.io", "password": "pwd"},
+])
+body = response.get_json()
+print(response.status_code, body["created"])
+for result in body["results"]:
+    print(result.get("error", "id" in result))
+
+""" NDJSON, blank and invalid lines included """
+lines = [json.dumps({"email": "n{}@hbtn.io".format(i),
+                     "password": "pwd{}".format(i)}) for i in range(1000)]
+lines[500:500] = ["", "{not json"]
+response = client.post("/api/v1/users/bulk",
+                       data="\n".join(lines) + "\n",
+                       content_type="application/x-ndjson")
+body = response.get_json()
+print(response.status_code, body["created"], len(body["results"]),
+      body["results"][500])
+
+""" Anything else is rejected """
+response = client.post("/api/v1/users/bulk", json={"email": "a@hbtn.io"})
+print(response.status_code, response.get_json())
+
+""" Everything was saved, passwords hashed """
+User.load_from_file()
+user = User.search({"email": "n999@hbtn.io"})[0]
+print(User.count(), user.is_valid_password("pwd999"),
+      User.search({"email": "a@hbtn.io"})[0].first_name)
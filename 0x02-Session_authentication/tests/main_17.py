@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+""" Main 17
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+os.environ["STORAGE_MODE"] = "write_behind"
+os.environ["WRITE_BEHIND_INTERVAL"] = "60"
+os.environ["WRITE_BEHIND_MAX_CHANGES"] = "50"
+for path in (".db_User.json", ".db_User.journal"):
+    if os.path.exists(path):
+        os.remove(path)
+from models.base import DIRTY, flush
+from models.user import User
+
+
+def saved() -> int:
+    """ Number of users in the file """
+    if not os.path.exists(".db_User.json"):
+        return 0
+    with open(".db_User.json") as f:
+        return len(json.load(f))
+
+
+""" Changes stay in memory until flush """
+User.load_from_file()
+for i in range(3):
+    User(email="user{}@hbtn.io".format(i)).save()
+print("Saved: {}, dirty: {}".format(saved(), list(DIRTY)))
+flush()
+print("Saved: {}, dirty: {}".format(saved(), list(DIRTY)))
+
+""" WRITE_BEHIND_MAX_CHANGES changes wake the flusher up """
+for i in range(3, 53):
+    User(email="user{}@hbtn.io".format(i)).save()
+time.sleep(0.5)
+print("Saved: {}".format(saved()))
+
+""" Reloading flushes the pending changes first """
+User(email="pending@hbtn.io").save()
+User.load_from_file()
+print("Users: {}, saved: {}".format(User.count(), saved()))
+
+""" Pending changes are flushed at exit """
+subprocess.run([sys.executable, "-c", (
+    "from models.user import User\n"
+    "User.load_from_file()\n"
+    "User(email='exit@hbtn.io').save()\n"
+)], check=True)
+print("Saved: {}".format(saved()))
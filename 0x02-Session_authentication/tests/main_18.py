@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+""" Main 18
+"""
+import hashlib
+import os
+
+os.environ["LOAD_MODE"] = "lazy"
+for path in (".db_User.json", ".db_User.journal"):
+    if os.path.exists(path):
+        os.remove(path)
+from models.base import DATA, LAZY
+from models.user import User
+
+""" Create users test """
+User.load_from_file()
+DATA["User"] = {}
+ids = []
+for i in range(1000):
+    user = User(email="user{}@hbtn.io".format(i),
+                first_name="Bob" if i % 100 == 0 else "Ann")
+    user.password = "pwd{}".format(i)
+    DATA["User"][user.id] = user
+    ids.append(user.id)
+User.save_to_file()
+
+""" Loading only maps the file """
+User.load_from_file()
+print("Built: {}, mapped: {}, count: {}".format(
+    len(DATA["User"]), len(LAZY["User"][1]), User.count()))
+
+""" Objects are built on demand """
+user = User.get(ids[10])
+print(user.email, len(DATA["User"]))
+found = User.search({"email": "user20@hbtn.io"})
+print(len(found), found[0].is_valid_password("pwd20"), len(DATA["User"]))
+print(len(User.search({"email": "user20@hbtn.io"})), len(DATA["User"]))
+print(len(User.search({"first_name": "Bob"})), len(DATA["User"]))
+password = hashlib.sha256(b"pwd40").hexdigest()
+print(len(User.search({"password": password})), len(DATA["User"]))
+page = User.page(5, after=sorted(ids)[-6])
+print([u.id for u in page] == sorted(ids)[-5:])
+
+""" Saving rewrites the objects not built yet too """
+user.last_name = "Dylan"
+user.save()
+User.get(ids[30]).remove()
+User.load_from_file()
+print("Built: {}, count: {}".format(len(DATA["User"]), User.count()))
+print(User.get(ids[10]).display_name(), User.get(ids[30]))
+print(len(User.all()), len(DATA["User"]))
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+""" Main 5
+"""
+import sys
+import timeit
+from models.base import DATA
+from models.user import User
+
+""" Fill the store in memory, without writing to file """
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+DATA["User"] = {}
+for i in range(count):
+    user = User(email="user{}@hbtn.io".format(i))
+    DATA["User"][user.id] = user
+User.reindex()
+print("Users: {}".format(User.count()))
+
+email = "user{}@hbtn.io".format(count - 1)
+number = 1000
+indexed = timeit.timeit(lambda: User.search({"email": email}), number=number)
+linear = timeit.timeit(
+    lambda: [u for u in DATA["User"].values() if u.email == email], number=10)
+print("Indexed search: {:.6f} ms".format(indexed * 1000 / number))
+print("Linear scan: {:.6f} ms".format(linear * 1000 / 10))
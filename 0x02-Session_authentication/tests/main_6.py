@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+""" Main 6
+"""
+import sys
+import time
+import tracemalloc
+from models.base import DATA
+from models.user import User
+
+""" Write a store of count users """
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+DATA["User"] = {}
+for i in range(count):
+    user = User(email="user{}@hbtn.io".format(i))
+    user.password = "pwd{}".format(i)
+    DATA["User"][user.id] = user
+User.save_to_file()
+DATA["User"] = {}
+
+""" Load it back """
+start = time.perf_counter()
+User.load_from_file()
+elapsed = time.perf_counter() - start
+DATA["User"] = {}
+User.reindex()
+tracemalloc.start()
+User.load_from_file()
+current, _ = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+print("Users: {}".format(User.count()))
+print("load_from_file: {:.2f}s".format(elapsed))
+print("Memory: {:.0f} bytes per user".format(current / count))
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+""" Main 7
+"""
+import json
+import threading
+from models.user import User
+
+""" Hammer the store from many threads """
+n_threads = 16
+n_users = 50
+User.load_from_file()
+start_count = User.count()
+errors = []
+
+
+def worker(n: int):
+    """ Create users, search them, remove half of them """
+    try:
+        users = []
+        for i in range(n_users):
+            user = User(email="t{}-{}@hbtn.io".format(n, i))
+            user.save()
+            users.append(user)
+            User.search({"email": user.email})
+            User.all()
+        for user in users[::2]:
+            user.remove()
+    except Exception as e:
+        errors.append(e)
+
+
+threads = [threading.Thread(target=worker, args=(n,))
+           for n in range(n_threads)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+
+expected = start_count + n_threads * n_users // 2
+print("Errors: {}".format(errors))
+print("Count: {} (expected {})".format(User.count(), expected))
+with open(".db_User.json") as f:
+    print("File is valid JSON: {}".format(type(json.load(f)) is dict))
+User.load_from_file()
+print("Reloaded: {} users".format(User.count()))
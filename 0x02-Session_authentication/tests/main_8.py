@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+""" Main 8
+"""
+import json
+import sys
+import time
+from models.base import DATA, TIMESTAMP_FORMAT
+from models.user import User
+from api.v1 import app as api
+from api.v1.fast_json import dumps, orjson
+
+
+def old_to_json(user: User) -> dict:
+    """ to_json before the serialization fast path """
+    result = {}
+    for key in ("id", "created_at", "updated_at", "email", "_password",
+                "first_name", "last_name"):
+        value = getattr(user, key, None)
+        if key[0] == '_':
+            continue
+        if hasattr(value, "strftime"):
+            result[key] = value.strftime(TIMESTAMP_FORMAT)
+        else:
+            result[key] = value
+    return result
+
+
+def bench(name: str, old, new, repeat: int) -> None:
+    """ Print the time of old and new """
+    timings = []
+    for fn in (old, new):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        timings.append((time.perf_counter() - start) / repeat * 1e6)
+    print("{}: {:.1f}us -> {:.1f}us ({:.1f}x)".format(
+        name, timings[0], timings[1], timings[0] / timings[1]))
+
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+DATA["User"] = {}
+for i in range(count):
+    user = User(email="user{}@hbtn.io".format(i), first_name="Bob")
+    DATA["User"][user.id] = user
+users = list(DATA["User"].values())
+one = users[0]
+print("Encoder: {}".format("orjson" if orjson else "json"))
+
+bench("detail to_json", lambda: old_to_json(one), one.to_json, 20000)
+bench("detail dumps",
+      lambda: json.dumps(old_to_json(one)),
+      lambda: dumps(one.to_json()), 20000)
+bench("list dumps ({} users)".format(count),
+      lambda: json.dumps([old_to_json(u) for u in users]),
+      lambda: dumps([u.to_json() for u in users]), 20)
+
+""" Through the app, without authentication """
+api.auth = None
+client = api.app.test_client()
+for path, repeat in (("/api/v1/users/" + one.id, 2000),
+                     ("/api/v1/users", 20)):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get(path)
+    elapsed = (time.perf_counter() - start) / repeat * 1e6
+    print("GET {}: {} {:.1f}us".format(
+        path.replace(one.id, "<id>"), response.status_code, elapsed))
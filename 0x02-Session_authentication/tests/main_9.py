@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+""" Main 9
+"""
+import base64
+import os
+import sys
+
+os.environ["AUTH_TYPE"] = sys.argv[1] if len(sys.argv) > 1 else \
+    "session_db_auth"
+os.environ.setdefault("SESSION_NAME", "_my_session_id")
+from models.user import User
+from models.user_session import UserSession
+from api.v1.app import app
+
+lookups = []
+
+
+def counted(cls: type, name: str) -> None:
+    """ Count the calls to the class method name of cls """
+    method = getattr(cls, name).__func__
+
+    def wrapper(klass, *args, **kwargs):
+        """ Record the call """
+        lookups.append("{}.{}".format(klass.__name__, name))
+        return method(klass, *args, **kwargs)
+    setattr(cls, name, classmethod(wrapper))
+
+
+""" Create a user test """
+User.load_from_file()
+user = User()
+user.email = "bob9@hbtn.io"
+user.password = "pwd9"
+user.save()
+
+client = app.test_client()
+headers = {}
+if os.environ["AUTH_TYPE"] == "basic_auth":
+    headers["Authorization"] = "Basic " + base64.b64encode(
+        b"bob9@hbtn.io:pwd9").decode()
+else:
+    client.post("/api/v1/auth_session/login",
+                data={"email": "bob9@hbtn.io", "password": "pwd9"})
+
+for cls in (User, UserSession):
+    for name in ("get", "search"):
+        counted(cls, name)
+
+""" Each request resolves its user once """
+for path in ("/api/v1/users/me", "/api/v1/users/me", "/api/v1/stats"):
+    del lookups[:]
+    response = client.get(path, headers=headers)
+    print("{} {}: {} lookups {}".format(
+        path, response.status_code, len(lookups), lookups))
+
+""" Sessions only kept in the database are not stored in the process """
+from api.v1 import app as api
+if api.auth is not None and hasattr(api.auth, "sessions"):
+    print(api.auth.sessions.stats())